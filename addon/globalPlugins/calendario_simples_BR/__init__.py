@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+# Carregado em toda inicialização do NVDA: só registra o atalho e o item de menu.
+# O calendário em si (submódulo calendario) é importado na primeira abertura.
+import sys
+import wx
+import addonHandler
+import globalPluginHandler
+import gui
+from logHandler import log
+from scriptHandler import script
+
+addonHandler.initTranslation()
+
+
+class GlobalPlugin(globalPluginHandler.GlobalPlugin):
+    def __init__(self):
+        super(GlobalPlugin, self).__init__()
+        self._menuItem = None
+        wx.CallAfter(self._addToToolsMenu)
+
+    def _addToToolsMenu(self):
+        try:
+            if gui.mainFrame and hasattr(gui.mainFrame, "sysTrayIcon"):
+                toolsMenu = gui.mainFrame.sysTrayIcon.toolsMenu
+                self._menuItem = toolsMenu.Append(wx.ID_ANY, "Calendário Simples BR")
+                gui.mainFrame.sysTrayIcon.Bind(wx.EVT_MENU, self.onMenu, self._menuItem)
+                log.info("CALENDARIO: Menu adicionado.")
+            else:
+                log.error("CALENDARIO: sysTrayIcon não encontrado.")
+        except Exception as e:
+            log.error("CALENDARIO: Erro ao adicionar menu: {}".format(e))
+
+    def onMenu(self, event):
+        self.openCalendar()
+
+    def terminate(self):
+        try:
+            if self._menuItem:
+                if gui.mainFrame and hasattr(gui.mainFrame, "sysTrayIcon"):
+                    gui.mainFrame.sysTrayIcon.toolsMenu.Remove(self._menuItem)
+        except Exception:
+            pass
+        # Só há janela e notas a descarregar se o calendário chegou a ser aberto.
+        calendario = sys.modules.get(__name__ + ".calendario")
+        if calendario is not None:
+            calendario.encerrar(gui.mainFrame)
+        super(GlobalPlugin, self).terminate()
+
+    @script(
+        description="Abrir Calendário Simples BR",
+        category="Calendário Simples BR",
+        gesture="kb:NVDA+shift+c",
+    )
+    def script_openCalendar(self, gesture):
+        self.openCalendar()
+
+    def openCalendar(self):
+        from . import calendario
+
+        calendario.abrir_calendario(gui.mainFrame)
@@ -0,0 +1,1948 @@
+# -*- coding: utf-8 -*-
+"""Interface do calendário, importada só na primeira abertura (ver __init__.py).
+
+Datas, feriados e fases da lua vêm de motor.py, que não depende do NVDA.
+"""
+import datetime
+import calendar
+import bisect
+import functools
+import math
+import wx
+import json
+import os
+import queue
+import re
+import shutil
+import threading
+import time
+import unicodedata
+from array import array
+import addonHandler
+import globalVars
+import ui
+import speech
+import tones
+import api
+from logHandler import log
+from . import motor
+from .motor import (
+    DIAS_ABREV,
+    MESES,
+    chave_nota,
+    contar_dias_uteis,
+    data_da_chave,
+    exportar_ics,
+    formato_data_pt,
+    formato_dia_mes,
+    get_fase_lua_nome,
+    get_intervalo_fase_lua,
+    get_sequencia_feriados,
+    get_visao_mes,
+    interpretar_localidade,
+    ler_eventos_ics,
+    mesclar_nota,
+    nome_localidade,
+    resolver_data_digitada,
+    somar_dias_uteis,
+)
+
+try:
+    import sqlite3
+except ImportError:
+    sqlite3 = None
+
+addonHandler.initTranslation()
+
+# Mensagens do motor vão para o log do NVDA.
+motor.log = log
+
+# --- CONSTANTES E DADOS ---
+# Sufixo exibido na grade nos dias que têm nota.
+MARCA_NOTA = "•"
+# Esc (ou Alt+F4) apenas esconde a janela, que é reaproveitada na próxima abertura.
+MANTER_CALENDARIO_ABERTO = True
+
+# Teclas de navegação que chegam a menos de JANELA_ANUNCIO_MS uma da outra (tecla
+# segurada) só movem a data; grade e fala são atualizadas uma vez, ao final. 0 desativa.
+JANELA_ANUNCIO_MS = 150
+
+# Máximo de datas listadas no resultado de uma busca nas notas.
+LIMITE_RESULTADOS_BUSCA = 500
+
+# Digitar números na grade vai direto para a data (ex.: 15, 15/3, 15/3/2027, 2027);
+# a data é confirmada e falada depois deste tempo sem novas teclas, ou com Enter.
+TEMPO_DIGITACAO_DATA_MS = 1200
+
+# Medição de tempos das teclas (F12 liga e desliga; Shift+F12 anuncia e grava no log).
+# Desligada, custa só uma verificação por tecla.
+MEDIR_TEMPOS_TECLAS = False
+# Amostras guardadas por ação; as mais antigas são sobrescritas.
+TAMANHO_HISTOGRAMA_TEMPOS = 256
+
+# --- DEFINIÇÃO DO ARQUIVO DE NOTAS (PERSISTENTE) ---
+ARQUIVO_NOTAS = os.path.join(globalVars.appArgs.configPath, "calendario_simples_notas.json")
+# Local antigo, na pasta globalPlugins do complemento.
+ARQUIVO_NOTAS_LEGADO = os.path.join(os.path.dirname(os.path.dirname(__file__)), "notas_calendario.json")
+# Diário de edições anexado ao snapshot; consolidado em ARQUIVO_NOTAS ao atingir o limite ou ao fechar.
+ARQUIVO_DIARIO_NOTAS = os.path.join(globalVars.appArgs.configPath, "calendario_simples_notas.diario")
+LIMITE_COMPACTACAO_DIARIO = 500
+
+# Armazenamento das notas: "json" (snapshot + diário, tudo em memória) ou
+# "sqlite" (banco indexado por data, consultado sob demanda mês a mês).
+ARMAZENAMENTO_NOTAS = "json"
+ARQUIVO_NOTAS_SQLITE = os.path.join(globalVars.appArgs.configPath, "calendario_simples_notas.sqlite3")
+
+# Edições feitas dentro deste intervalo (segundos) são gravadas juntas pela thread de gravação.
+INTERVALO_GRAVACAO_NOTAS = 0.5
+
+# Intervalo mínimo, em segundos, entre os anúncios de progresso da importação de .ics.
+INTERVALO_PROGRESSO_IMPORTACAO = 3.0
+
+# Localidade escolhida (código IBGE da UF ou do município); ausente = só feriados nacionais.
+ARQUIVO_LOCALIDADE = os.path.join(globalVars.appArgs.configPath, "calendario_simples_localidade.json")
+
+
+def carregar_localidade():
+    try:
+        with open(ARQUIVO_LOCALIDADE, "r", encoding="utf-8") as f:
+            return int(json.load(f).get("localidade") or 0)
+    except FileNotFoundError:
+        return 0
+    except Exception as e:
+        log.error("CALENDARIO: Erro ao carregar localidade: {}".format(e))
+        return 0
+
+
+def salvar_localidade(localidade):
+    try:
+        with open(ARQUIVO_LOCALIDADE, "w", encoding="utf-8") as f:
+            json.dump({"localidade": localidade}, f)
+    except Exception as e:
+        log.error("CALENDARIO: Erro ao salvar localidade: {}".format(e))
+
+
+def _end_modal_or_destroy(dlg, return_code=wx.ID_CANCEL):
+    try:
+        if hasattr(dlg, "IsModal") and dlg.IsModal():
+            dlg.EndModal(return_code)
+        else:
+            dlg.Destroy()
+    except Exception:
+        try:
+            dlg.Destroy()
+        except Exception:
+            pass
+
+
+class DiarioNotas(object):
+    """Registro somente de anexação das edições de notas.
+
+    Cada edição vira uma linha JSON ({"k": chave, "v": texto ou null}) gravada
+    com fsync. O estado atual é o snapshot mais as linhas reaplicadas em ordem;
+    reaplicar é idempotente, então um diário que sobreviva à compactação não
+    causa perda nem duplicação.
+    """
+
+    def __init__(self, caminho):
+        self.caminho = caminho
+        self.registros = 0
+
+    def reaplicar(self, notas):
+        """Aplica o diário sobre `notas`. Linhas incompletas (queda no meio da escrita) são ignoradas."""
+        self.registros = 0
+        if not os.path.exists(self.caminho):
+            return
+        with open(self.caminho, "r", encoding="utf-8") as f:
+            for linha in f:
+                try:
+                    registro = json.loads(linha)
+                    chave = registro["k"]
+                    texto = registro["v"]
+                except (ValueError, KeyError, TypeError):
+                    log.error("CALENDARIO: Registro inválido ignorado no diário de notas.")
+                    continue
+                if texto is None:
+                    notas.pop(chave, None)
+                else:
+                    notas[chave] = texto
+                self.registros += 1
+
+    def anexar(self, alteracoes):
+        """Anexa os pares (chave, texto) numa única escrita com fsync."""
+        linhas = [json.dumps({"k": chave, "v": texto}, ensure_ascii=False) + "\n" for chave, texto in alteracoes]
+        with open(self.caminho, "a", encoding="utf-8") as f:
+            f.write("".join(linhas))
+            f.flush()
+            os.fsync(f.fileno())
+        self.registros += len(linhas)
+
+    def existe(self):
+        return os.path.exists(self.caminho)
+
+    def limpar(self):
+        if os.path.exists(self.caminho):
+            os.remove(self.caminho)
+        self.registros = 0
+
+
+class IndiceNotas(object):
+    """Datas com nota: máscara de bits por (ano, mês) e ordinais ordenados para busca binária."""
+
+    def __init__(self, chaves=()):
+        self.mascaras = {}
+        ordinais = []
+        for chave in chaves:
+            dt = data_da_chave(chave)
+            if dt is not None:
+                self._marcar(dt, True)
+                ordinais.append(dt.toordinal())
+        ordinais.sort()
+        self.ordinais = array("l", ordinais)
+
+    def _marcar(self, dt, tem_nota):
+        mes = (dt.year, dt.month)
+        bit = 1 << (dt.day - 1)
+        if tem_nota:
+            self.mascaras[mes] = self.mascaras.get(mes, 0) | bit
+        else:
+            mascara = self.mascaras.get(mes, 0) & ~bit
+            if mascara:
+                self.mascaras[mes] = mascara
+            else:
+                self.mascaras.pop(mes, None)
+
+    def adicionar(self, dt):
+        if not self.mascara(dt.year, dt.month) & (1 << (dt.day - 1)):
+            self._marcar(dt, True)
+            bisect.insort(self.ordinais, dt.toordinal())
+
+    def remover(self, dt):
+        if self.mascara(dt.year, dt.month) & (1 << (dt.day - 1)):
+            self._marcar(dt, False)
+            del self.ordinais[bisect.bisect_left(self.ordinais, dt.toordinal())]
+
+    def mascara(self, ano, mes):
+        """Bit (dia - 1) ligado para cada dia do mês com nota."""
+        return self.mascaras.get((ano, mes), 0)
+
+    def proxima(self, dt, passo):
+        """Próxima (passo > 0) ou anterior (passo < 0) data com nota, ou None."""
+        ordinal = dt.toordinal()
+        if passo > 0:
+            pos = bisect.bisect_right(self.ordinais, ordinal)
+            if pos < len(self.ordinais):
+                return datetime.date.fromordinal(self.ordinais[pos])
+        else:
+            pos = bisect.bisect_left(self.ordinais, ordinal)
+            if pos > 0:
+                return datetime.date.fromordinal(self.ordinais[pos - 1])
+        return None
+
+
+_RE_PALAVRA = re.compile(r"\w+")
+
+
+def normalizar_palavras(texto):
+    """Palavras do texto em minúsculas e sem acentos."""
+    texto = texto.casefold()
+    if not texto.isascii():
+        texto = "".join(c for c in unicodedata.normalize("NFKD", texto) if not unicodedata.combining(c))
+    return _RE_PALAVRA.findall(texto)
+
+
+class IndiceBusca(object):
+    """Índice invertido das notas: palavra normalizada -> ordinais das datas que a contêm."""
+
+    def __init__(self, itens=()):
+        self.termos = {}
+        self.por_data = {}
+        self._vocabulario = None
+        for chave, texto in itens:
+            self.atualizar(chave, texto)
+
+    def atualizar(self, chave, texto):
+        """Reindexa a nota de `chave`; texto None a remove do índice."""
+        dt = data_da_chave(chave)
+        if dt is None:
+            return
+        ordinal = dt.toordinal()
+        for palavra in self.por_data.pop(ordinal, ()):
+            datas = self.termos.get(palavra)
+            if datas is not None:
+                datas.discard(ordinal)
+                if not datas:
+                    del self.termos[palavra]
+                    self._vocabulario = None
+        if texto:
+            palavras = frozenset(normalizar_palavras(texto))
+            self.por_data[ordinal] = palavras
+            for palavra in palavras:
+                datas = self.termos.get(palavra)
+                if datas is None:
+                    self.termos[palavra] = datas = set()
+                    self._vocabulario = None
+                datas.add(ordinal)
+
+    def _com_prefixo(self, prefixo):
+        if self._vocabulario is None:
+            self._vocabulario = sorted(self.termos)
+        vocab = self._vocabulario
+        resultado = set()
+        pos = bisect.bisect_left(vocab, prefixo)
+        while pos < len(vocab) and vocab[pos].startswith(prefixo):
+            resultado |= self.termos[vocab[pos]]
+            pos += 1
+        return resultado
+
+    def buscar(self, consulta):
+        """Datas (em ordem) cujas notas contêm todas as palavras; a última vale como prefixo."""
+        palavras = normalizar_palavras(consulta)
+        if not palavras:
+            return []
+        conjuntos = [self.termos.get(p, set()) for p in palavras[:-1]]
+        conjuntos.append(self._com_prefixo(palavras[-1]))
+        conjuntos.sort(key=len)
+        resultado = set(conjuntos[0])
+        for conjunto in conjuntos[1:]:
+            resultado &= conjunto
+            if not resultado:
+                break
+        return [datetime.date.fromordinal(o) for o in sorted(resultado)]
+
+
+class ArmazemNotasJson(object):
+    """Notas mantidas num dict em memória, persistidas no snapshot JSON mais o diário.
+
+    aplicar() altera a memória na thread da interface; persistir() e salvar()
+    fazem a E/S e podem rodar na thread de gravação.
+    """
+
+    def __init__(self, caminho, caminho_diario):
+        self.caminho = caminho
+        self.diario = DiarioNotas(caminho_diario)
+        self.notas = {}
+        self.indice = IndiceNotas()
+        self._lock = threading.Lock()
+
+    def carregar(self):
+        notas = {}
+        try:
+            if os.path.exists(self.caminho):
+                with open(self.caminho, "r", encoding="utf-8") as f:
+                    dados = json.load(f)
+                    notas = dados if isinstance(dados, dict) else {}
+        except Exception as e:
+            log.error("CALENDARIO: Erro ao carregar notas: {}".format(e))
+            return
+
+        try:
+            self.diario.reaplicar(notas)
+        except Exception as e:
+            log.error("CALENDARIO: Erro ao ler diário de notas: {}".format(e))
+
+        self.notas = notas
+        self.indice = IndiceNotas(notas)
+        if self.diario.existe():
+            # Consolida já na abertura para que as próximas linhas comecem num diário limpo.
+            self.salvar()
+
+    def obter(self, chave):
+        return self.notas.get(chave)
+
+    def mascara_mes(self, ano, mes):
+        return self.indice.mascara(ano, mes)
+
+    def proxima_com_nota(self, dt, passo):
+        # A exportação consulta o índice fora da thread da interface.
+        with self._lock:
+            return self.indice.proxima(dt, passo)
+
+    def itens(self):
+        """Pares (chave, texto) em ordem de data."""
+        with self._lock:
+            return sorted(self.notas.items())
+
+    def aplicar(self, chave, texto):
+        """Grava ou, com texto None, remove a nota de `chave` na memória."""
+        dt = data_da_chave(chave)
+        with self._lock:
+            if texto is None:
+                self.notas.pop(chave, None)
+                if dt is not None:
+                    self.indice.remover(dt)
+            else:
+                self.notas[chave] = texto
+                if dt is not None:
+                    self.indice.adicionar(dt)
+
+    def persistir(self, alteracoes):
+        """Registra no diário as alterações ({chave: texto}) já aplicadas."""
+        try:
+            self.diario.anexar(alteracoes.items())
+        except Exception as e:
+            log.error("CALENDARIO: Erro ao gravar diário de notas: {}".format(e))
+            self.salvar()
+            return
+        if self.diario.registros >= LIMITE_COMPACTACAO_DIARIO:
+            self.salvar()
+
+    def salvar(self):
+        """Consolida tudo num novo snapshot e descarta o diário."""
+        pasta = os.path.dirname(self.caminho)
+        tmp_path = os.path.join(pasta, "calendario_simples_BR_notas.tmp")
+        with self._lock:
+            notas = dict(self.notas)
+
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(notas, f, ensure_ascii=False)
+            os.replace(tmp_path, self.caminho)
+            # Só depois do snapshot no lugar o diário pode ser descartado.
+            self.diario.limpar()
+        except Exception:
+            try:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+            except Exception:
+                pass
+            raise
+
+    def fechar(self):
+        if self.diario.registros:
+            self.salvar()
+
+
+class ArmazemNotasSqlite(object):
+    """Notas num banco SQLite com chave primária na data.
+
+    Nada é carregado na abertura: as datas com nota são consultadas por mês,
+    conforme o mês visível, e o texto só quando pedido. Alterações aplicadas
+    e ainda não persistidas ficam em `_pendentes` e têm precedência nas leituras.
+
+    A thread de gravação usa uma conexão própria e o banco fica em modo WAL,
+    então as leituras da interface não esperam por uma escrita em andamento.
+    """
+
+    def __init__(self, caminho, caminho_json, caminho_diario):
+        self.caminho = caminho
+        self.caminho_json = caminho_json
+        self.caminho_diario = caminho_diario
+        self.conexao = None
+        self.conexao_escrita = None
+        # Serializa só o uso da conexão de escrita.
+        self._lock = threading.Lock()
+        self._pendentes = {}
+        self._mes_cache = None
+        self._chaves_mes = set()
+
+    def carregar(self):
+        self.conexao = sqlite3.connect(self.caminho, check_same_thread=False)
+        self.conexao.execute("PRAGMA journal_mode=WAL")
+        self.conexao.execute("CREATE TABLE IF NOT EXISTS notas (data TEXT PRIMARY KEY, texto TEXT NOT NULL) WITHOUT ROWID")
+        self.conexao.execute("CREATE TABLE IF NOT EXISTS meta (chave TEXT PRIMARY KEY, valor TEXT) WITHOUT ROWID")
+        self.conexao.commit()
+        self.conexao_escrita = sqlite3.connect(self.caminho, check_same_thread=False)
+        if os.path.exists(self.caminho_json):
+            self._migrar_json()
+
+    def _migrar_json(self):
+        """Importa as notas do JSON uma única vez; o arquivo antigo fica como .migrado.
+
+        A marca "migrado" é gravada na mesma transação das notas: sem ela a
+        migração é refeita na próxima abertura (INSERT OR REPLACE, então
+        repetir não duplica nada). Com ela, um JSON que reapareceu (sessão
+        que caiu para o armazém JSON) não é importado por cima do banco; só
+        passa a ser o .migrado. Uma falha é propagada, para que esta sessão
+        continue com as notas em JSON.
+        """
+        destino = self.caminho_json + ".migrado"
+        try:
+            if self.conexao.execute("SELECT 1 FROM meta WHERE chave = 'migrado'").fetchone() is not None:
+                os.replace(self.caminho_json, destino)
+                log.info("CALENDARIO: Banco SQLite já migrado; notas em JSON guardadas em {}.".format(destino))
+                return
+            origem = ArmazemNotasJson(self.caminho_json, self.caminho_diario)
+            origem.carregar()
+            with self.conexao:
+                self.conexao.executemany("INSERT OR REPLACE INTO notas (data, texto) VALUES (?, ?)", origem.notas.items())
+                self.conexao.execute(
+                    "INSERT OR REPLACE INTO meta (chave, valor) VALUES ('migrado', ?)", (chave_nota(datetime.date.today()),)
+                )
+            os.replace(self.caminho_json, destino)
+        except Exception as e:
+            log.error("CALENDARIO: Falha ao migrar notas para SQLite: {}".format(e))
+            self.fechar()
+            raise
+        log.info("CALENDARIO: {} notas migradas para SQLite.".format(len(origem.notas)))
+
+    def _chaves_do_mes(self, prefixo):
+        if prefixo != self._mes_cache:
+            cursor = self.conexao.execute(
+                "SELECT data FROM notas WHERE data BETWEEN ? AND ?", (prefixo + "-01", prefixo + "-31")
+            )
+            chaves = {linha[0] for linha in cursor}
+            for chave, texto in list(self._pendentes.items()):
+                if chave.startswith(prefixo):
+                    if texto is None:
+                        chaves.discard(chave)
+                    else:
+                        chaves.add(chave)
+            self._chaves_mes = chaves
+            self._mes_cache = prefixo
+        return self._chaves_mes
+
+    def obter(self, chave):
+        if chave in self._pendentes:
+            return self._pendentes[chave]
+        linha = self.conexao.execute("SELECT texto FROM notas WHERE data = ?", (chave,)).fetchone()
+        return linha[0] if linha else None
+
+    def mascara_mes(self, ano, mes):
+        mascara = 0
+        for chave in self._chaves_do_mes("{:04d}-{:02d}".format(ano, mes)):
+            mascara |= 1 << (int(chave[8:10]) - 1)
+        return mascara
+
+    def proxima_com_nota(self, dt, passo):
+        """Busca pelo índice da chave primária, considerando as alterações pendentes."""
+        chave = chave_nota(dt)
+        adiante = passo > 0
+        candidatos = [k for k, t in list(self._pendentes.items()) if t is not None and (k > chave if adiante else k < chave)]
+        sql = "SELECT data FROM notas WHERE data {} ? ORDER BY data {} LIMIT 1".format(
+            ">" if adiante else "<", "ASC" if adiante else "DESC"
+        )
+        while True:
+            linha = self.conexao.execute(sql, (chave,)).fetchone()
+            if linha is None:
+                break
+            if self._pendentes.get(linha[0], "") is not None:
+                candidatos.append(linha[0])
+                break
+            # Removida mas ainda não persistida: continua a partir dela.
+            chave = linha[0]
+        if not candidatos:
+            return None
+        return data_da_chave(min(candidatos) if adiante else max(candidatos))
+
+    def itens(self):
+        """Pares (chave, texto) em ordem de data, já com as alterações pendentes."""
+        itens = dict(self.conexao.execute("SELECT data, texto FROM notas"))
+        for chave, texto in list(self._pendentes.items()):
+            if texto is None:
+                itens.pop(chave, None)
+            else:
+                itens[chave] = texto
+        return sorted(itens.items())
+
+    def aplicar(self, chave, texto):
+        self._pendentes[chave] = texto
+        if chave[:7] == self._mes_cache:
+            if texto is None:
+                self._chaves_mes.discard(chave)
+            else:
+                self._chaves_mes.add(chave)
+
+    def persistir(self, alteracoes):
+        remover = [(chave,) for chave, texto in alteracoes.items() if texto is None]
+        gravar = [(chave, texto) for chave, texto in alteracoes.items() if texto is not None]
+        with self._lock, self.conexao_escrita:
+            self.conexao_escrita.executemany("DELETE FROM notas WHERE data = ?", remover)
+            self.conexao_escrita.executemany("INSERT OR REPLACE INTO notas (data, texto) VALUES (?, ?)", gravar)
+        for chave, texto in alteracoes.items():
+            # Só descarta o pendente se ninguém o alterou de novo durante a gravação.
+            if chave in self._pendentes and self._pendentes[chave] is texto:
+                del self._pendentes[chave]
+
+    def salvar(self):
+        with self._lock:
+            self.conexao_escrita.commit()
+
+    def fechar(self):
+        with self._lock:
+            for conexao in (self.conexao_escrita, self.conexao):
+                if conexao is not None:
+                    conexao.close()
+            self.conexao_escrita = None
+            self.conexao = None
+
+
+def criar_armazem_notas():
+    if ARMAZENAMENTO_NOTAS == "sqlite":
+        if sqlite3 is not None:
+            return ArmazemNotasSqlite(ARQUIVO_NOTAS_SQLITE, ARQUIVO_NOTAS, ARQUIVO_DIARIO_NOTAS)
+        log.error("CALENDARIO: sqlite3 indisponível, usando notas em JSON.")
+    return ArmazemNotasJson(ARQUIVO_NOTAS, ARQUIVO_DIARIO_NOTAS)
+
+
+_COMPACTAR = object()
+_FECHAR = object()
+_gravadores_ativos = set()
+
+
+class GravadorNotas(threading.Thread):
+    """Persiste as notas fora da thread da interface (a thread de GUI do NVDA).
+
+    Pedidos que chegam em rajada, com menos de INTERVALO_GRAVACAO_NOTAS entre
+    si, viram uma única escrita. Erros são anunciados de volta na thread da
+    interface via wx.CallAfter.
+    """
+
+    def __init__(self, armazem):
+        super(GravadorNotas, self).__init__(name="CalendarioSimplesBR.gravador", daemon=True)
+        self.armazem = armazem
+        self.fila = queue.Queue()
+
+    def start(self):
+        _gravadores_ativos.add(self)
+        super(GravadorNotas, self).start()
+
+    def agendar(self, chave, texto):
+        self.fila.put((chave, texto))
+
+    def agendar_lote(self, alteracoes):
+        """Grava várias alterações ({chave: texto}) numa única escrita."""
+        self.fila.put(dict(alteracoes))
+
+    def compactar(self):
+        self.fila.put(_COMPACTAR)
+
+    def fechar(self):
+        """Grava o que estiver pendente, fecha o armazém e encerra a thread."""
+        self.fila.put(_FECHAR)
+
+    def run(self):
+        fechar = False
+        while not fechar:
+            item = self.fila.get()
+            alteracoes = {}
+            compactar = False
+            while True:
+                if item is _FECHAR:
+                    fechar = True
+                    break
+                elif item is _COMPACTAR:
+                    compactar = True
+                elif isinstance(item, dict):
+                    alteracoes.update(item)
+                else:
+                    alteracoes[item[0]] = item[1]
+                try:
+                    item = self.fila.get(timeout=INTERVALO_GRAVACAO_NOTAS)
+                except queue.Empty:
+                    break
+            self._gravar(alteracoes, compactar, fechar)
+        _gravadores_ativos.discard(self)
+
+    def _gravar(self, alteracoes, compactar, fechar):
+        try:
+            if alteracoes:
+                self.armazem.persistir(alteracoes)
+            if compactar:
+                self.armazem.salvar()
+        except Exception as e:
+            log.error("CALENDARIO: Erro ao salvar notas: {}".format(e))
+            wx.CallAfter(ui.message, "Erro ao salvar nota.")
+        if fechar:
+            try:
+                self.armazem.fechar()
+            except Exception as e:
+                log.error("CALENDARIO: Erro ao fechar notas: {}".format(e))
+
+
+def encerrar_gravadores(timeout=5.0):
+    """Descarrega e encerra todas as threads de gravação, esperando até `timeout` segundos cada."""
+    for gravador in list(_gravadores_ativos):
+        gravador.fechar()
+        gravador.join(timeout)
+
+
+# --- MEDIÇÃO DE TEMPOS ---
+class HistogramaTempos(object):
+    """Últimas amostras (em segundos) de uma ação, num buffer circular de tamanho fixo."""
+
+    __slots__ = ("amostras", "proxima", "total")
+
+    def __init__(self, tamanho):
+        self.amostras = array("d", bytes(8 * tamanho))
+        self.proxima = 0
+        self.total = 0
+
+    def registrar(self, segundos):
+        self.amostras[self.proxima] = segundos
+        self.proxima = (self.proxima + 1) % len(self.amostras)
+        self.total += 1
+
+    def resumo(self):
+        """(amostras guardadas, p50, p95, máximo), em segundos."""
+        ordenadas = sorted(self.amostras[: min(self.total, len(self.amostras))])
+        n = len(ordenadas)
+        if not n:
+            return 0, 0.0, 0.0, 0.0
+
+        def percentil(fracao):
+            return ordenadas[max(0, math.ceil(fracao * n) - 1)]
+
+        return n, percentil(0.5), percentil(0.95), ordenadas[-1]
+
+
+class MedidorTempos(object):
+    """Histogramas de latência por ação (teclas e os métodos que elas chamam)."""
+
+    def __init__(self, tamanho=TAMANHO_HISTOGRAMA_TEMPOS):
+        self.tamanho = tamanho
+        self.histogramas = {}
+
+    def registrar(self, acao, segundos):
+        histograma = self.histogramas.get(acao)
+        if histograma is None:
+            histograma = self.histogramas[acao] = HistogramaTempos(self.tamanho)
+        histograma.registrar(segundos)
+
+    def envolver(self, acao, funcao):
+        """`funcao` com cada chamada cronometrada sob o nome `acao`."""
+
+        @functools.wraps(funcao)
+        def medida(*args, **kwargs):
+            inicio = time.perf_counter()
+            try:
+                return funcao(*args, **kwargs)
+            finally:
+                self.registrar(acao, time.perf_counter() - inicio)
+
+        return medida
+
+    def linhas(self):
+        """Uma linha por ação, da mais lenta (p95) para a mais rápida."""
+        resumos = [(acao,) + h.resumo() for acao, h in self.histogramas.items()]
+        resumos.sort(key=lambda r: r[3], reverse=True)
+        return [
+            "{}: {} amostras, p50 {:.1f} ms, p95 {:.1f} ms, máximo {:.1f} ms".format(
+                acao, n, p50 * 1000, p95 * 1000, maximo * 1000
+            )
+            for acao, n, p50, p95, maximo in resumos
+        ]
+
+
+def _nome_tecla(evt):
+    code = evt.GetKeyCode()
+    nomes = {
+        wx.WXK_LEFT: "Esquerda",
+        wx.WXK_RIGHT: "Direita",
+        wx.WXK_UP: "Cima",
+        wx.WXK_DOWN: "Baixo",
+        wx.WXK_PAGEUP: "PageUp",
+        wx.WXK_PAGEDOWN: "PageDown",
+        wx.WXK_HOME: "Home",
+        wx.WXK_END: "End",
+        wx.WXK_RETURN: "Enter",
+        wx.WXK_NUMPAD_ENTER: "Enter",
+        wx.WXK_ESCAPE: "Esc",
+    }
+    if code in nomes:
+        nome = nomes[code]
+    elif wx.WXK_F1 <= code <= wx.WXK_F24:
+        nome = "F{}".format(code - wx.WXK_F1 + 1)
+    elif 32 < code < 127:
+        nome = chr(code).upper()
+    else:
+        nome = str(code)
+    if evt.ShiftDown():
+        nome = "Shift+" + nome
+    if evt.ControlDown():
+        nome = "Ctrl+" + nome
+    return nome
+
+
+# --- CLASSES DE INTERFACE ---
+class AjudaDialog(wx.Dialog):
+    """Diálogo de ajuda acessível com navegação por setas."""
+
+    def __init__(self, parent, content):
+        super(AjudaDialog, self).__init__(parent, title="Ajuda do Calendário", size=(600, 450))
+
+        panel = wx.Panel(self)
+        vbox = wx.BoxSizer(wx.VERTICAL)
+
+        self.text_ctrl = wx.TextCtrl(
+            panel,
+            value=content,
+            style=wx.TE_MULTILINE | wx.TE_READONLY | wx.TE_BESTWRAP | wx.TE_RICH,
+        )
+        vbox.Add(self.text_ctrl, 1, wx.EXPAND | wx.ALL, 10)
+
+        btn_close = wx.Button(panel, wx.ID_OK, label="Fechar")
+        vbox.Add(btn_close, 0, wx.ALIGN_CENTER | wx.BOTTOM, 10)
+
+        panel.SetSizer(vbox)
+
+        self.text_ctrl.SetFocus()
+        self.text_ctrl.SetInsertionPoint(0)
+
+        self.Bind(wx.EVT_CHAR_HOOK, self.onKey)
+
+    def onKey(self, evt):
+        if evt.GetKeyCode() == wx.WXK_ESCAPE:
+            _end_modal_or_destroy(self, wx.ID_CANCEL)
+        else:
+            evt.Skip()
+
+
+class ListaFeriadosDialog(wx.Dialog):
+    def __init__(self, parent, ano, feriados_lista):
+        super(ListaFeriadosDialog, self).__init__(parent, title="Feriados de {}".format(ano), size=(500, 400))
+        panel = wx.Panel(self)
+        sizer = wx.BoxSizer(wx.VERTICAL)
+
+        lista_txt = wx.ListBox(panel, choices=feriados_lista, style=wx.LB_SINGLE)
+        sizer.Add(lista_txt, 1, wx.EXPAND | wx.ALL, 10)
+
+        btn_fechar = wx.Button(panel, wx.ID_OK, label="Fechar")
+        sizer.Add(btn_fechar, 0, wx.ALIGN_CENTER | wx.BOTTOM, 10)
+
+        panel.SetSizer(sizer)
+        lista_txt.SetFocus()
+
+        self.Bind(wx.EVT_CHAR_HOOK, self.onKey)
+
+    def onKey(self, evt):
+        if evt.GetKeyCode() == wx.WXK_ESCAPE:
+            _end_modal_or_destroy(self, wx.ID_CANCEL)
+        else:
+            evt.Skip()
+
+
+class ResultadosBuscaDialog(wx.Dialog):
+    """Lista as datas encontradas; Enter vai para a data selecionada."""
+
+    def __init__(self, parent, consulta, resultados):
+        super(ResultadosBuscaDialog, self).__init__(
+            parent, title="Notas com \"{}\" ({})".format(consulta, len(resultados)), size=(600, 450)
+        )
+        panel = wx.Panel(self)
+        sizer = wx.BoxSizer(wx.VERTICAL)
+
+        self.lista = wx.ListBox(panel, choices=resultados, style=wx.LB_SINGLE)
+        if resultados:
+            self.lista.SetSelection(0)
+        sizer.Add(self.lista, 1, wx.EXPAND | wx.ALL, 10)
+
+        btn_ir = wx.Button(panel, wx.ID_OK, label="Ir para a data")
+        btn_fechar = wx.Button(panel, wx.ID_CANCEL, label="Fechar")
+        botoes = wx.BoxSizer(wx.HORIZONTAL)
+        botoes.Add(btn_ir, 0, wx.RIGHT, 10)
+        botoes.Add(btn_fechar, 0)
+        sizer.Add(botoes, 0, wx.ALIGN_CENTER | wx.BOTTOM, 10)
+
+        panel.SetSizer(sizer)
+        btn_ir.SetDefault()
+        self.lista.SetFocus()
+
+        self.lista.Bind(wx.EVT_LISTBOX_DCLICK, lambda evt: self.EndModal(wx.ID_OK))
+        self.Bind(wx.EVT_CHAR_HOOK, self.onKey)
+
+    def onKey(self, evt):
+        if evt.GetKeyCode() == wx.WXK_ESCAPE:
+            _end_modal_or_destroy(self, wx.ID_CANCEL)
+        else:
+            evt.Skip()
+
+
+# Cores da grade (as mesmas dos antigos rótulos de dia).
+COR_FUNDO = wx.Colour(0, 0, 0)
+COR_CABECALHO = wx.Colour(150, 150, 150)
+COR_DIA = wx.Colour(255, 255, 255)
+COR_SELECIONADO = (wx.Colour(255, 255, 0), wx.Colour(0, 0, 0))
+COR_HOJE = wx.Colour(255, 100, 100)
+COR_FERIADO = wx.Colour(255, 0, 0)
+
+
+class GradeMes(wx.Window):
+    """Grade do mês desenhada num único controle.
+
+    Substitui os 49 StaticText: um só EVT_PAINT desenha cabeçalho e dias, e
+    trocar o dia destacado dentro do mês invalida apenas as duas células
+    envolvidas. Para leitores de tela, o controle expõe um único objeto
+    acessível cujo nome é o dia destacado, consultado na navegação de
+    objetos; o foco fica no painel e a fala continua por ui.message, então
+    a grade não dispara eventos de mudança.
+    """
+
+    ESPACO_H = 20
+    ESPACO_V = 10
+    MARGEM = 5
+
+    def __init__(self, parent):
+        super(GradeMes, self).__init__(parent, style=wx.BORDER_NONE)
+        self.SetBackgroundStyle(wx.BG_STYLE_PAINT)
+        self.SetBackgroundColour(COR_FUNDO)
+
+        self.fonte_cabecalho = self.GetFont()
+        self.fonte_dia = wx.Font(self.fonte_cabecalho)
+        self.fonte_dia.PointSize += 14
+
+        dc = wx.ClientDC(self)
+        dc.SetFont(self.fonte_cabecalho)
+        largura_cab, self.altura_cabecalho = dc.GetTextExtent(max(DIAS_ABREV, key=len))
+        dc.SetFont(self.fonte_dia)
+        largura_dia, altura_dia = dc.GetTextExtent("30{}".format(MARCA_NOTA))
+        self.largura_celula = max(largura_cab, largura_dia) + 2 * self.MARGEM
+        self.altura_celula = altura_dia + 2 * self.MARGEM
+
+        # VisaoMes e dia de hoje do que está desenhado.
+        self.visao = None
+        self.hoje = None
+        self.destacado = None
+
+        self.SetMinSize(self._tamanho_total())
+        if hasattr(wx, "Accessible"):
+            self.SetAccessible(_AcessivelGrade(self))
+        self.Bind(wx.EVT_PAINT, self.onPaint)
+
+    def _tamanho_total(self):
+        largura = 7 * self.largura_celula + 6 * self.ESPACO_H
+        altura = self.altura_cabecalho + 6 * (self.altura_celula + self.ESPACO_V)
+        return wx.Size(largura, altura)
+
+    def _retangulo(self, indice):
+        """Retângulo da célula `indice` (0 a 41) da área de dias."""
+        coluna, linha = indice % 7, indice // 7
+        x = coluna * (self.largura_celula + self.ESPACO_H)
+        y = self.altura_cabecalho + self.ESPACO_V + linha * (self.altura_celula + self.ESPACO_V)
+        return wx.Rect(x, y, self.largura_celula, self.altura_celula)
+
+    def data_destacada(self):
+        if self.visao is None:
+            return None
+        return datetime.date(self.visao.ano, self.visao.mes, self.destacado)
+
+    def mostrar(self, visao, dia, hoje):
+        """Atualiza o modelo; com a mesma VisaoMes só as células que mudaram são redesenhadas."""
+        if visao is self.visao and hoje == self.hoje:
+            if dia != self.destacado:
+                anterior = self.destacado
+                self.destacado = dia
+                self.RefreshRect(self._retangulo(visao.offset + anterior - 1))
+                self.RefreshRect(self._retangulo(visao.offset + dia - 1))
+            return
+        self.visao = visao
+        self.hoje = hoje
+        self.destacado = dia
+        self.Refresh()
+
+    def onPaint(self, evt):
+        dc = wx.AutoBufferedPaintDC(self)
+        dc.SetBackground(wx.Brush(COR_FUNDO))
+        dc.Clear()
+        dc.SetPen(wx.TRANSPARENT_PEN)
+
+        dc.SetFont(self.fonte_cabecalho)
+        dc.SetTextForeground(COR_CABECALHO)
+        for coluna, abrev in enumerate(DIAS_ABREV):
+            largura, _altura = dc.GetTextExtent(abrev)
+            x = coluna * (self.largura_celula + self.ESPACO_H) + (self.largura_celula - largura) // 2
+            dc.DrawText(abrev, x, 0)
+
+        visao = self.visao
+        if visao is None:
+            return
+        dia_hoje = self.hoje.day if (self.hoje.year, self.hoje.month) == (visao.ano, visao.mes) else None
+        atualizar = self.GetUpdateRegion()
+        dc.SetFont(self.fonte_dia)
+        for dia in range(1, visao.num_dias + 1):
+            ret = self._retangulo(visao.offset + dia - 1)
+            if atualizar.Contains(ret) == wx.OutRegion:
+                continue
+            texto = "{}{}".format(dia, MARCA_NOTA) if visao.tem_nota(dia) else str(dia)
+            largura, altura = dc.GetTextExtent(texto)
+            x = ret.x + (ret.width - largura) // 2
+            y = ret.y + (ret.height - altura) // 2
+            if dia == self.destacado:
+                fundo, frente = COR_SELECIONADO
+                dc.SetBrush(wx.Brush(fundo))
+                dc.DrawRectangle(x, y, largura, altura)
+            elif dia == dia_hoje:
+                frente = COR_HOJE
+            elif visao.feriados[dia - 1]:
+                frente = COR_FERIADO
+            else:
+                frente = COR_DIA
+            dc.SetTextForeground(frente)
+            dc.DrawText(texto, x, y)
+
+
+if hasattr(wx, "Accessible"):
+
+    class _AcessivelGrade(wx.Accessible):
+        """Objeto acessível único da grade: nome e valor refletem o dia destacado."""
+
+        def GetName(self, childId):
+            data = self.GetWindow().data_destacada()
+            if data is None:
+                return (wx.ACC_OK, "Calendário")
+            return (wx.ACC_OK, formato_data_pt(data))
+
+        def GetRole(self, childId):
+            return (wx.ACC_OK, wx.ROLE_SYSTEM_TABLE)
+
+        def GetValue(self, childId):
+            visao = self.GetWindow().visao
+            if visao is None:
+                return (wx.ACC_OK, "")
+            return (wx.ACC_OK, "{} {}".format(MESES[visao.mes - 1], visao.ano))
+
+
+class CalendarioFrame(wx.Frame):
+    def __init__(self, parent=None, inicio_abertura=None):
+        style = wx.DEFAULT_FRAME_STYLE | wx.STAY_ON_TOP
+        super(CalendarioFrame, self).__init__(parent, title="Calendário Simples BR", size=(900, 700), style=style)
+
+        self.today = datetime.date.today()
+        self.currentDate = self.today
+        self._mes_exibido = None
+        # Estado do agrupamento de anúncios durante navegação rápida.
+        self._ultimo_anuncio = 0.0
+        self._anuncio_pendente = False
+        self._mudou_contexto_pendente = False
+        self._timer_anuncio = None
+        self._encerrando = False
+        # Momento (time.perf_counter) em que a abertura foi pedida, para medir até a primeira fala.
+        self._inicio_abertura = inicio_abertura
+
+        self.notas = self.carregar_notas()
+        self.gravador_notas = GravadorNotas(self.notas)
+        self.gravador_notas.start()
+        # Construído na primeira busca.
+        self.indice_busca = None
+        self.localidade = carregar_localidade()
+        self._importando = False
+        # Notas editadas na interface enquanto uma importação lia o arquivo.
+        self._editadas_na_importacao = set()
+        self._exportando = False
+        # Data marcada com U para contar dias úteis até a data atual.
+        self.marca_dias_uteis = None
+        # MedidorTempos enquanto a medição estiver ligada.
+        self.medidor = None
+        # Data digitada direto na grade; a origem é a data antes do primeiro dígito.
+        self._digitacao = ""
+        self._origem_digitacao = None
+        self._timer_digitacao = None
+
+        self.panel = wx.Panel(self, style=wx.WANTS_CHARS)
+        self.panel.SetBackgroundColour(wx.Colour(0, 0, 0))
+        self.panel.SetForegroundColour(wx.Colour(255, 255, 255))
+
+        self.main_sizer = wx.BoxSizer(wx.VERTICAL)
+
+        self.label_mes = wx.StaticText(self.panel, label="", style=wx.ALIGN_CENTER_HORIZONTAL)
+        font_mes = self.label_mes.GetFont()
+        font_mes.PointSize += 22
+        font_mes.SetWeight(wx.FONTWEIGHT_BOLD)
+        self.label_mes.SetFont(font_mes)
+        self.main_sizer.Add(self.label_mes, 0, wx.ALL | wx.ALIGN_CENTER_HORIZONTAL, 20)
+
+        self.grade = GradeMes(self.panel)
+        self.main_sizer.Add(self.grade, 1, wx.ALIGN_CENTER_HORIZONTAL | wx.TOP, 10)
+
+        # Largura fixa (EXPAND, sem redimensionar) para trocar o texto sem refazer o layout.
+        self.label_data = wx.StaticText(
+            self.panel,
+            label=formato_data_pt(self.currentDate),
+            style=wx.ALIGN_CENTER_HORIZONTAL | wx.ST_NO_AUTORESIZE,
+        )
+        font_data = self.label_data.GetFont()
+        font_data.PointSize += 16
+        self.label_data.SetFont(font_data)
+        self.label_data.SetForegroundColour(wx.Colour(0, 255, 0))
+        self.main_sizer.Add(self.label_data, 0, wx.ALL | wx.EXPAND, 20)
+
+        self.panel.SetSizer(self.main_sizer)
+        self.panel.Bind(wx.EVT_KEY_DOWN, self.onKeyDown)
+
+        self.Bind(wx.EVT_ACTIVATE, self.onActivate)
+        self.Bind(wx.EVT_CLOSE, self.onClose)
+
+        if MEDIR_TEMPOS_TECLAS:
+            self.alternar_medicao(anunciar=False)
+
+        self.update_ui()
+        self.Center()
+        self.Show()
+        self.Raise()
+        self.panel.SetFocus()
+
+        self.focus_timer = wx.Timer(self)
+        self.Bind(wx.EVT_TIMER, self._force_focus, self.focus_timer)
+        self.focus_timer.StartOnce(250)
+
+        wx.CallLater(600, self.initial_announcement)
+
+    def _garantir_pasta_notas(self):
+        try:
+            pasta = os.path.dirname(ARQUIVO_NOTAS)
+            if pasta and not os.path.isdir(pasta):
+                os.makedirs(pasta, exist_ok=True)
+        except Exception as e:
+            log.error("CALENDARIO: Falha ao garantir pasta de notas: {}".format(e))
+
+    def carregar_notas(self):
+        self._garantir_pasta_notas()
+
+        if os.path.exists(ARQUIVO_NOTAS_LEGADO) and not os.path.exists(ARQUIVO_NOTAS):
+            try:
+                shutil.move(ARQUIVO_NOTAS_LEGADO, ARQUIVO_NOTAS)
+                log.info("CALENDARIO: Notas migradas para local seguro.")
+            except Exception as e:
+                log.error("CALENDARIO: Falha ao migrar notas: {}".format(e))
+
+        armazem = criar_armazem_notas()
+        if isinstance(armazem, ArmazemNotasSqlite):
+            try:
+                armazem.carregar()
+                return armazem
+            except Exception as e:
+                log.error("CALENDARIO: Erro ao carregar notas: {}".format(e))
+
+        # Notas já migradas para SQLite não somem ao voltar (ou cair) para o JSON.
+        migrado = ARQUIVO_NOTAS + ".migrado"
+        if not os.path.exists(ARQUIVO_NOTAS) and os.path.exists(migrado):
+            try:
+                shutil.copyfile(migrado, ARQUIVO_NOTAS)
+            except Exception as e:
+                log.error("CALENDARIO: Falha ao restaurar notas migradas: {}".format(e))
+        armazem = ArmazemNotasJson(ARQUIVO_NOTAS, ARQUIVO_DIARIO_NOTAS)
+        armazem.carregar()
+        return armazem
+
+    def definir_nota(self, chave, texto):
+        """Grava (ou, com texto None, remove) só a nota de `chave`, sem bloquear a interface."""
+        self._garantir_pasta_notas()
+        self.notas.aplicar(chave, texto)
+        self.gravador_notas.agendar(chave, texto)
+        if self.indice_busca is not None:
+            self.indice_busca.atualizar(chave, texto)
+        if self._importando:
+            self._editadas_na_importacao.add(chave)
+
+    def _force_focus(self, event=None):
+        try:
+            if self and self.IsShown() and not self.IsBeingDeleted():
+                self.Raise()
+                self.panel.SetFocus()
+        except Exception:
+            pass
+
+    def onClose(self, evt):
+        try:
+            if hasattr(self, "focus_timer") and self.focus_timer and self.focus_timer.IsRunning():
+                self.focus_timer.Stop()
+        except Exception:
+            pass
+        if self._digitacao:
+            self._cancelar_digitacao(anunciar=False)
+        # Oculto, o quadro não é destruído: um fim de rajada pendente falaria uma data antiga.
+        if self._timer_anuncio is not None:
+            self._timer_anuncio.Stop()
+            self._timer_anuncio = None
+        self._anuncio_pendente = False
+        self._mudou_contexto_pendente = False
+        if MANTER_CALENDARIO_ABERTO and not self._encerrando and evt.CanVeto():
+            evt.Veto()
+            self.Hide()
+            return
+        self.gravador_notas.fechar()
+        evt.Skip()
+
+    def encerrar(self):
+        """Fecha de fato a janela, mesmo com MANTER_CALENDARIO_ABERTO."""
+        self._encerrando = True
+        self.Close(force=True)
+
+    def reabrir(self, inicio_abertura=None):
+        """Mostra de novo a janela escondida, já posicionada no dia de hoje."""
+        self._inicio_abertura = inicio_abertura
+        self.today = datetime.date.today()
+        self.currentDate = self.today
+        self.update_ui()
+        self.Show()
+        self.Raise()
+        self.panel.SetFocus()
+        self.focus_timer.StartOnce(250)
+        ui.message("Calendário. {}".format(formato_data_pt(self.today)))
+        self._registrar_latencia_abertura("quente")
+
+    def _registrar_latencia_abertura(self, tipo):
+        if self._inicio_abertura is not None:
+            latencia = (time.perf_counter() - self._inicio_abertura) * 1000
+            log.info("CALENDARIO: Abertura {} até a primeira fala: {:.0f} ms".format(tipo, latencia))
+            self._inicio_abertura = None
+
+    def onActivate(self, evt):
+        if evt.GetActive():
+            self.panel.SetFocus()
+        evt.Skip()
+
+    def update_ui(self):
+        """Atualiza os rótulos e a grade; o layout só é refeito quando o mês muda."""
+        ano = self.currentDate.year
+        mes = self.currentDate.month
+
+        visao = self.visao_mes()
+        self.label_data.SetLabel(visao.datas[self.currentDate.day - 1])
+        self.grade.mostrar(visao, self.currentDate.day, self.today)
+
+        if (ano, mes) != self._mes_exibido:
+            self._mes_exibido = (ano, mes)
+            self.label_mes.SetLabel("{} {}".format(MESES[mes - 1].upper(), ano))
+            self.panel.Layout()
+
+    def visao_mes(self, ano=None, mes=None):
+        """VisaoMes do mês pedido (por padrão, o da data atual)."""
+        ano = self.currentDate.year if ano is None else ano
+        mes = self.currentDate.month if mes is None else mes
+        return get_visao_mes(ano, mes, self.notas.mascara_mes(ano, mes), self.localidade)
+
+    def mostrar_lista_feriados(self):
+        ano = self.currentDate.year
+
+        lista_formatada = []
+        for mes in range(1, 13):
+            lista_formatada.extend(self.visao_mes(ano, mes).linhas_feriados)
+
+        ui.message("Listando feriados de {}".format(ano))
+        dlg = ListaFeriadosDialog(self, ano, lista_formatada)
+        dlg.ShowModal()
+        dlg.Destroy()
+        self.panel.SetFocus()
+
+    def escolher_localidade(self):
+        dlg = wx.TextEntryDialog(
+            self,
+            "Sigla do estado ou código IBGE do município (vazio para só feriados nacionais):",
+            "Feriados Locais",
+            value=str(self.localidade) if self.localidade else "",
+        )
+        if dlg.ShowModal() == wx.ID_OK:
+            localidade = interpretar_localidade(dlg.GetValue())
+            if localidade is None:
+                ui.message("Localidade inválida.")
+            else:
+                self.localidade = localidade
+                salvar_localidade(localidade)
+                if localidade:
+                    ui.message("Feriados de {}.".format(nome_localidade(localidade)))
+                else:
+                    ui.message("Só feriados nacionais.")
+                self.announce()
+        dlg.Destroy()
+        self.panel.SetFocus()
+
+    def exportar_calendario(self):
+        if self._exportando:
+            ui.message("Exportação já em andamento.")
+            return
+        ano = self.currentDate.year
+        dlg = wx.TextEntryDialog(
+            self, "Anos a exportar (AAAA ou AAAA-AAAA):", "Exportar Calendário", value=str(ano)
+        )
+        texto = dlg.GetValue().strip() if dlg.ShowModal() == wx.ID_OK else ""
+        dlg.Destroy()
+        if not texto:
+            self.panel.SetFocus()
+            return
+        try:
+            partes = [int(p) for p in texto.split("-")]
+            if len(partes) not in (1, 2):
+                raise ValueError(texto)
+            inicio = datetime.date(partes[0], 1, 1)
+            fim = datetime.date(partes[-1], 12, 31)
+            if fim < inicio:
+                raise ValueError(texto)
+        except ValueError:
+            ui.message("Intervalo inválido.")
+            self.panel.SetFocus()
+            return
+
+        nome_padrao = "calendario_{}.ics".format(texto)
+        dlg = wx.FileDialog(
+            self,
+            "Salvar calendário",
+            defaultFile=nome_padrao,
+            wildcard="iCalendar (*.ics)|*.ics",
+            style=wx.FD_SAVE | wx.FD_OVERWRITE_PROMPT,
+        )
+        caminho = dlg.GetPath() if dlg.ShowModal() == wx.ID_OK else ""
+        dlg.Destroy()
+        self.panel.SetFocus()
+        if not caminho:
+            return
+        self._exportando = True
+        ui.message("Exportando calendário.")
+        threading.Thread(
+            target=self._exportar_em_segundo_plano,
+            args=(caminho, inicio, fim, self.localidade),
+            name="CalendarioSimplesBR.exportacao",
+            daemon=True,
+        ).start()
+
+    def _exportar_em_segundo_plano(self, caminho, inicio, fim, localidade):
+        """Grava o arquivo fora da thread da interface; o resultado é anunciado nela."""
+        try:
+            total = exportar_ics(caminho, inicio, fim, self.notas, localidade)
+        except Exception as e:
+            log.error("CALENDARIO: Erro ao exportar calendário: {}".format(e))
+            total = None
+        wx.CallAfter(self._concluir_exportacao, total)
+
+    def _concluir_exportacao(self, total):
+        self._exportando = False
+        if not self or self.IsBeingDeleted():
+            return
+        if total is None:
+            ui.message("Erro ao exportar.")
+        else:
+            ui.message("{} eventos exportados.".format(total))
+
+    def importar_calendario(self):
+        if self._importando:
+            ui.message("Importação já em andamento.")
+            return
+        dlg = wx.FileDialog(
+            self,
+            "Importar calendário",
+            wildcard="iCalendar (*.ics)|*.ics",
+            style=wx.FD_OPEN | wx.FD_FILE_MUST_EXIST,
+        )
+        caminho = dlg.GetPath() if dlg.ShowModal() == wx.ID_OK else ""
+        dlg.Destroy()
+        self.panel.SetFocus()
+        if not caminho:
+            return
+        self._importando = True
+        self._editadas_na_importacao = set()
+        ui.message("Importando calendário.")
+        threading.Thread(
+            target=self._importar_em_segundo_plano,
+            args=(caminho,),
+            name="CalendarioSimplesBR.importacao",
+            daemon=True,
+        ).start()
+
+    def _importar_em_segundo_plano(self, caminho):
+        """Lê o arquivo e mescla os eventos às notas fora da thread da interface.
+
+        Só o dicionário de alterações volta para a interface; obter() pode ser
+        chamado desta thread, como na exportação.
+        """
+        por_chave = {}
+        alteracoes = {}
+        total = 0
+        inicio = time.perf_counter()
+        proximo_aviso = inicio + INTERVALO_PROGRESSO_IMPORTACAO
+        try:
+            with open(caminho, "r", encoding="utf-8-sig", errors="replace") as f:
+                for data, texto in ler_eventos_ics(f):
+                    por_chave.setdefault(chave_nota(data), []).append(texto)
+                    total += 1
+                    agora = time.perf_counter()
+                    if agora >= proximo_aviso:
+                        proximo_aviso = agora + INTERVALO_PROGRESSO_IMPORTACAO
+                        wx.CallAfter(ui.message, "Importando: {} eventos lidos.".format(total))
+            for chave, textos in por_chave.items():
+                atual = self.notas.obter(chave)
+                novo = mesclar_nota(atual, textos)
+                if novo != atual:
+                    alteracoes[chave] = novo
+        except Exception as e:
+            log.error("CALENDARIO: Erro ao importar calendário: {}".format(e))
+            wx.CallAfter(self._concluir_importacao, None, None, 0)
+            return
+        log.info(
+            "CALENDARIO: {} eventos de {} lidos e mesclados em {:.3f} s.".format(
+                total, caminho, time.perf_counter() - inicio
+            )
+        )
+        wx.CallAfter(self._concluir_importacao, por_chave, alteracoes, total)
+
+    def _concluir_importacao(self, por_chave, alteracoes, total):
+        """Aplica as alterações já mescladas e grava tudo numa única escrita."""
+        self._importando = False
+        editadas = self._editadas_na_importacao
+        self._editadas_na_importacao = set()
+        if not self or self.IsBeingDeleted():
+            return
+        if alteracoes is None:
+            ui.message("Erro ao importar.")
+            return
+
+        # A mescla usou o texto de antes dessas edições; refaz só para elas.
+        for chave in editadas & por_chave.keys():
+            atual = self.notas.obter(chave)
+            novo = mesclar_nota(atual, por_chave[chave])
+            if novo != atual:
+                alteracoes[chave] = novo
+            else:
+                alteracoes.pop(chave, None)
+        if alteracoes:
+            self._garantir_pasta_notas()
+            for chave, texto in alteracoes.items():
+                self.notas.aplicar(chave, texto)
+            # Reconstruído na próxima busca, em vez de atualizado aqui dia a dia.
+            self.indice_busca = None
+            self.gravador_notas.agendar_lote(alteracoes)
+            self.update_ui()
+        ui.message("{} eventos importados. {} dias alterados.".format(total, len(alteracoes)))
+
+    def ir_para_feriado(self, passo):
+        """Vai para o próximo (passo > 0) ou anterior feriado e diz quantos dias faltam a partir de hoje."""
+        resultado = get_sequencia_feriados(self.localidade).proximo(self.currentDate, passo)
+        if resultado is None:
+            tones.beep(200, 100)
+            ui.message("Nenhum feriado adiante." if passo > 0 else "Nenhum feriado antes.")
+            return
+        destino = resultado[0]
+        dias = (destino - self.today).days
+        if dias == 0:
+            contagem = "É hoje."
+        elif dias == 1:
+            contagem = "Falta 1 dia."
+        elif dias > 1:
+            contagem = "Faltam {} dias.".format(dias)
+        elif dias == -1:
+            contagem = "Foi há 1 dia."
+        else:
+            contagem = "Foi há {} dias.".format(-dias)
+        mudou_mes = (destino.year, destino.month) != (self.currentDate.year, self.currentDate.month)
+        self.currentDate = destino
+        self._mudou_contexto_pendente = self._mudou_contexto_pendente or mudou_mes
+        self._anunciar_agora(complemento=contagem)
+
+    def marcar_inicio_dias_uteis(self):
+        self.marca_dias_uteis = self.currentDate
+        ui.message("Início marcado: {}".format(formato_data_pt(self.currentDate)))
+
+    def anunciar_dias_uteis(self):
+        if self.marca_dias_uteis is None:
+            tones.beep(200, 100)
+            ui.message("Marque a data inicial com U.")
+            return
+        inicio, fim = sorted((self.marca_dias_uteis, self.currentDate))
+        try:
+            total = contar_dias_uteis(inicio, fim, self.localidade)
+        except OverflowError:
+            ui.message("Data fora do calendário.")
+            return
+        ui.message(
+            "{} {} de {} de {} a {} de {}.".format(
+                total,
+                "dia útil" if total == 1 else "dias úteis",
+                formato_dia_mes(inicio),
+                inicio.year,
+                formato_dia_mes(fim),
+                fim.year,
+            )
+        )
+
+    def dialogo_somar_dias_uteis(self):
+        dlg = wx.TextEntryDialog(self, "Quantidade de dias úteis (negativa para voltar):", "Somar Dias Úteis")
+        texto = dlg.GetValue().strip() if dlg.ShowModal() == wx.ID_OK else ""
+        dlg.Destroy()
+        self.panel.SetFocus()
+        if not texto:
+            return
+        try:
+            destino = somar_dias_uteis(self.currentDate, int(texto), self.localidade)
+        except ValueError:
+            ui.message("Número inválido.")
+            return
+        except OverflowError:
+            ui.message("Data fora do calendário.")
+            return
+        mudou_mes = (destino.year, destino.month) != (self.currentDate.year, self.currentDate.month)
+        self.currentDate = destino
+        self.announce(mudou_contexto=mudou_mes)
+
+    def dialogo_ir_para_data(self):
+        dlg = wx.TextEntryDialog(self, "Digite a data (DD/MM/AAAA):", "Ir Para Data")
+        if dlg.ShowModal() == wx.ID_OK:
+            texto = dlg.GetValue()
+            try:
+                partes = texto.split("/")
+                if len(partes) == 3:
+                    dia, mes, ano = map(int, partes)
+                    nova_data = datetime.date(ano, mes, dia)
+                    self.currentDate = nova_data
+                    self.announce(mudou_contexto=True)
+                else:
+                    ui.message("Formato inválido. Use dia barra mês barra ano.")
+            except ValueError:
+                ui.message("Data inválida.")
+        dlg.Destroy()
+        self.panel.SetFocus()
+
+    def copiar_data_clipboard(self):
+        texto = self.visao_mes().datas[self.currentDate.day - 1]
+        if api.copyToClip(texto):
+            ui.message("Copiado: {}".format(texto))
+        else:
+            ui.message("Erro ao copiar.")
+
+    def anunciar_dia_ano(self):
+        timetuple = self.currentDate.timetuple()
+        dia_do_ano = timetuple.tm_yday
+        ano = self.currentDate.year
+        eh_bissexto = calendar.isleap(ano)
+        total_dias = 366 if eh_bissexto else 365
+        faltam = total_dias - dia_do_ano
+
+        msg = "Dia {} de {}. Faltam {} dias para o fim do ano.".format(dia_do_ano, total_dias, faltam)
+        ui.message(msg)
+
+    def anunciar_fase_lua_detalhada(self):
+        """Anuncia a fase simplificada e calcula o intervalo de dias dessa fase."""
+        fase_atual = get_fase_lua_nome(self.currentDate)
+        data_inicio, data_fim = get_intervalo_fase_lua(self.currentDate)
+
+        msg = "{}. De {} a {}.".format(
+            fase_atual,
+            formato_dia_mes(data_inicio),
+            formato_dia_mes(data_fim),
+        )
+        ui.message(msg)
+
+    def gerenciar_nota(self):
+        chave = chave_nota(self.currentDate)
+        nota_atual = self.notas.obter(chave) or ""
+
+        titulo = "Nota do Dia: {}".format(formato_data_pt(self.currentDate))
+        dlg = wx.TextEntryDialog(self, "Edite a nota:", titulo, value=nota_atual, style=wx.TE_MULTILINE | wx.OK | wx.CANCEL)
+
+        if dlg.ShowModal() == wx.ID_OK:
+            nova_nota = dlg.GetValue().strip()
+            if nova_nota:
+                ui.message("Nota salva.")
+                self.definir_nota(chave, nova_nota)
+            else:
+                if nota_atual:
+                    ui.message("Nota removida.")
+                    self.definir_nota(chave, None)
+            self.announce()
+
+        dlg.Destroy()
+        self.panel.SetFocus()
+
+    def ir_para_nota(self, passo):
+        """Vai para o próximo (passo > 0) ou anterior (passo < 0) dia com nota, em qualquer mês ou ano."""
+        destino = self.notas.proxima_com_nota(self.currentDate, passo)
+        if destino is None:
+            tones.beep(200, 100)
+            ui.message("Nenhuma nota adiante." if passo > 0 else "Nenhuma nota antes.")
+            return
+        mudou_mes = (destino.year, destino.month) != (self.currentDate.year, self.currentDate.month)
+        self.currentDate = destino
+        self.announce(mudou_contexto=mudou_mes)
+
+    def buscar_notas(self):
+        dlg = wx.TextEntryDialog(self, "Palavras a buscar nas notas:", "Buscar Notas")
+        consulta = dlg.GetValue().strip() if dlg.ShowModal() == wx.ID_OK else ""
+        dlg.Destroy()
+        if not consulta:
+            self.panel.SetFocus()
+            return
+
+        if self.indice_busca is None:
+            self.indice_busca = IndiceBusca(self.notas.itens())
+        datas = self.indice_busca.buscar(consulta)
+        if not datas:
+            ui.message("Nenhuma nota encontrada.")
+            self.panel.SetFocus()
+            return
+
+        exibidas = datas[:LIMITE_RESULTADOS_BUSCA]
+        resultados = []
+        for dt in exibidas:
+            texto = " ".join((self.notas.obter(chave_nota(dt)) or "").split())
+            if len(texto) > 80:
+                texto = texto[:80] + "..."
+            resultados.append("{:02d}/{:02d}/{} ({}): {}".format(dt.day, dt.month, dt.year, DIAS_ABREV[dt.weekday()], texto))
+
+        if len(datas) > len(exibidas):
+            ui.message("{} notas encontradas, exibindo as {} primeiras.".format(len(datas), len(exibidas)))
+        else:
+            ui.message("{} notas encontradas.".format(len(datas)))
+        dlg = ResultadosBuscaDialog(self, consulta, resultados)
+        escolha = dlg.lista.GetSelection() if dlg.ShowModal() == wx.ID_OK else wx.NOT_FOUND
+        dlg.Destroy()
+        self.panel.SetFocus()
+        if escolha != wx.NOT_FOUND:
+            destino = exibidas[escolha]
+            mudou_mes = (destino.year, destino.month) != (self.currentDate.year, self.currentDate.month)
+            self.currentDate = destino
+            self.announce(mudou_contexto=mudou_mes)
+
+    def mostrar_ajuda(self):
+        texto_ajuda = (
+            "--- Atalhos do Calendário ---\n\n"
+            "Navegação:\n"
+            "- Setas (Esquerda/Direita): Dia anterior / próximo\n"
+            "- Setas (Cima/Baixo): Semana anterior / próxima\n"
+            "- PageUp / PageDown: Mês anterior / próximo\n"
+            "- Home: Primeiro dia do mês\n"
+            "- End: Último dia do mês\n"
+            "- Ctrl + Home: Ano anterior\n"
+            "- Ctrl + End: Próximo ano\n\n"
+            "Ações:\n"
+            "- Enter: Abrir/Editar nota do dia selecionado\n"
+            "- F: Anunciar fase da lua e seu período (início e fim)\n"
+            "- G: Ir para uma data específica\n"
+            "- Números: Ir direto para uma data enquanto digita (15, 15/3, 15/3/2027 ou 2027); "
+            "Enter confirma, Esc cancela\n"
+            "- H: Ir para a data atual (Hoje)\n"
+            "- C: Copiar data para área de transferência\n"
+            "- D: Anunciar dias restantes para o fim do ano\n"
+            "- L: Listar todos os feriados do ano\n"
+            "- N / Shift + N: Próximo / anterior dia com nota\n"
+            "- B: Buscar palavras nas notas\n"
+            "- R / Shift + R: Próximo / anterior feriado, com os dias que faltam\n"
+            "- M: Escolher estado ou município dos feriados locais\n"
+            "- E: Exportar feriados e notas para um arquivo .ics\n"
+            "- I: Importar eventos de um arquivo .ics como notas\n"
+            "- U: Marcar data inicial para contar dias úteis\n"
+            "- Shift + U: Anunciar dias úteis da data marcada até a atual\n"
+            "- P: Avançar ou voltar um número de dias úteis\n\n"
+            "Geral:\n"
+            "- F1: Exibir esta ajuda (use setas para ler)\n"
+            "- F12: Ligar/desligar a medição de tempos das teclas\n"
+            "- Shift + F12: Anunciar os tempos medidos e gravá-los no log\n"
+            "- Esc: Fechar calendário ou ajuda"
+        )
+
+        ui.message("Exibindo ajuda.")
+        dlg = AjudaDialog(self, texto_ajuda)
+        dlg.ShowModal()
+        dlg.Destroy()
+        self.panel.SetFocus()
+
+    def initial_announcement(self):
+        if self.IsActive():
+            ui.message("Calendário. {}".format(formato_data_pt(self.today)))
+            self._registrar_latencia_abertura("fria")
+
+    def announce(self, mudou_contexto=False):
+        """Anuncia a data atual; em rajadas de teclas, só o estado final é desenhado e falado."""
+        self._mudou_contexto_pendente = self._mudou_contexto_pendente or mudou_contexto
+        em_rajada = self._timer_anuncio is not None or (
+            time.perf_counter() - self._ultimo_anuncio < JANELA_ANUNCIO_MS / 1000.0
+        )
+        if JANELA_ANUNCIO_MS <= 0 or not em_rajada:
+            self._anunciar_agora()
+            return
+        self._anuncio_pendente = True
+        if self._timer_anuncio is None:
+            self._timer_anuncio = wx.CallLater(JANELA_ANUNCIO_MS, self._fim_rajada)
+        else:
+            self._timer_anuncio.Start(JANELA_ANUNCIO_MS)
+
+    def _fim_rajada(self):
+        self._timer_anuncio = None
+        if not self or self.IsBeingDeleted():
+            return
+        if self._anuncio_pendente:
+            # A fala do início da rajada já não corresponde à data atual.
+            speech.cancelSpeech()
+            self._anunciar_agora()
+
+    def _anunciar_agora(self, complemento=None):
+        """Desenha e fala a data atual já; `complemento` é dito logo depois dela, na mesma fala."""
+        mudou_contexto = self._mudou_contexto_pendente
+        self._mudou_contexto_pendente = False
+        self._anuncio_pendente = False
+        self._ultimo_anuncio = time.perf_counter()
+
+        self.update_ui()
+        if mudou_contexto:
+            ui.message("{} de {}".format(MESES[self.currentDate.month - 1], self.currentDate.year))
+
+        if self.currentDate == self.today:
+            tones.beep(880, 50)
+
+        fala = self.visao_mes().falas[self.currentDate.day - 1]
+        if complemento:
+            fala = "{}. {}".format(fala, complemento)
+        ui.message(fala)
+
+    def move_safe(self, dias):
+        nova_data = self.currentDate + datetime.timedelta(days=dias)
+        if nova_data.month == self.currentDate.month and nova_data.year == self.currentDate.year:
+            self.currentDate = nova_data
+            self.announce()
+        else:
+            tones.beep(200, 100)
+
+    # Métodos cronometrados, além da própria tecla, enquanto a medição estiver ligada.
+    METODOS_MEDIDOS = ("update_ui", "_anunciar_agora", "definir_nota", "visao_mes")
+
+    def alternar_medicao(self, anunciar=True):
+        """Liga ou desliga a medição de tempos das teclas.
+
+        Ligada, os métodos de METODOS_MEDIDOS (e o desenho da grade) são
+        substituídos nesta instância por versões cronometradas; desligada, as
+        substituições são removidas e nada mais é medido.
+        """
+        if self.medidor is None:
+            self.medidor = MedidorTempos()
+            for nome in self.METODOS_MEDIDOS:
+                setattr(self, nome, self.medidor.envolver(nome, getattr(self, nome)))
+            self.grade.mostrar = self.medidor.envolver("grade", self.grade.mostrar)
+            log.info("CALENDARIO: Medição de tempos ligada.")
+            if anunciar:
+                ui.message("Medição de tempos ligada.")
+        else:
+            self.registrar_tempos()
+            for nome in self.METODOS_MEDIDOS:
+                delattr(self, nome)
+            del self.grade.mostrar
+            self.medidor = None
+            if anunciar:
+                ui.message("Medição de tempos desligada.")
+
+    def registrar_tempos(self):
+        """Grava no log do NVDA o resumo de cada ação medida."""
+        linhas = self.medidor.linhas() if self.medidor is not None else []
+        resumo = "\n".join(linhas) or "nenhuma amostra"
+        log.info("CALENDARIO: Tempos das teclas (até {} amostras por ação):\n{}".format(TAMANHO_HISTOGRAMA_TEMPOS, resumo))
+
+    def anunciar_tempos(self):
+        if self.medidor is None:
+            ui.message("Medição de tempos desligada. Pressione F12 para ligar.")
+            return
+        self.registrar_tempos()
+        linhas = self.medidor.linhas()
+        if not linhas:
+            ui.message("Nenhuma amostra ainda.")
+            return
+        ui.message("Mais lentas: {}. Resumo completo no log.".format(". ".join(linhas[:3])))
+
+    def _digitar(self, caractere):
+        """Acrescenta um dígito ou "/" à data digitada e move a grade, sem falar."""
+        if not self._digitacao:
+            self._origem_digitacao = self.currentDate
+        elif len(self._digitacao) >= 10:
+            tones.beep(200, 50)
+            return
+        self._digitacao += caractere
+        self._mover_para_digitacao()
+
+    def _apagar_digito(self):
+        self._digitacao = self._digitacao[:-1]
+        if not self._digitacao:
+            self._cancelar_digitacao()
+            return
+        self._mover_para_digitacao()
+
+    def _mover_para_digitacao(self):
+        destino = resolver_data_digitada(self._digitacao, self._origem_digitacao) or self._origem_digitacao
+        if destino != self.currentDate:
+            self.currentDate = destino
+            self.update_ui()
+        if self._timer_digitacao is None:
+            self._timer_digitacao = wx.CallLater(TEMPO_DIGITACAO_DATA_MS, self._confirmar_digitacao)
+        else:
+            self._timer_digitacao.Start(TEMPO_DIGITACAO_DATA_MS)
+
+    def _parar_timer_digitacao(self):
+        if self._timer_digitacao is not None:
+            self._timer_digitacao.Stop()
+            self._timer_digitacao = None
+
+    def _confirmar_digitacao(self):
+        """Fixa a data digitada e a anuncia numa única fala."""
+        self._parar_timer_digitacao()
+        texto = self._digitacao
+        self._digitacao = ""
+        if not texto or not self or self.IsBeingDeleted():
+            return
+        destino = resolver_data_digitada(texto, self._origem_digitacao, completa=True)
+        if destino is None:
+            self.currentDate = self._origem_digitacao
+            self.update_ui()
+            tones.beep(200, 100)
+            ui.message("Data inválida: {}".format(texto))
+            return
+        self.currentDate = destino
+        self._mudou_contexto_pendente = False
+        self._anunciar_agora()
+
+    def _cancelar_digitacao(self, anunciar=True):
+        self._parar_timer_digitacao()
+        self._digitacao = ""
+        self.currentDate = self._origem_digitacao
+        self.update_ui()
+        if anunciar:
+            ui.message("Digitação cancelada.")
+
+    def _tratar_digitacao(self, evt, code):
+        """Trata a tecla se ela fizer parte da digitação de uma data; devolve True nesse caso."""
+        if evt.ControlDown() or evt.AltDown():
+            return False
+        if ord("0") <= code <= ord("9"):
+            # Com Shift a fileira de números produz símbolos ("/" é Shift+7 no ABNT2).
+            if evt.ShiftDown():
+                return False
+            self._digitar(chr(code))
+            return True
+        if wx.WXK_NUMPAD0 <= code <= wx.WXK_NUMPAD9:
+            self._digitar(chr(ord("0") + code - wx.WXK_NUMPAD0))
+            return True
+        if not self._digitacao:
+            return False
+        if code in (ord("/"), ord("."), ord("-"), wx.WXK_NUMPAD_DIVIDE, wx.WXK_NUMPAD_DECIMAL, wx.WXK_NUMPAD_SUBTRACT):
+            if self._digitacao.endswith("/") or self._digitacao.count("/") >= 2:
+                tones.beep(200, 50)
+            else:
+                self._digitar("/")
+            return True
+        if code == wx.WXK_BACK:
+            self._apagar_digito()
+            return True
+        if code == wx.WXK_ESCAPE:
+            self._cancelar_digitacao()
+            return True
+        if code in (wx.WXK_RETURN, wx.WXK_NUMPAD_ENTER):
+            self._confirmar_digitacao()
+            return True
+        return False
+
+    def onKeyDown(self, evt):
+        # A própria tecla pode desligar a medição (F12); a amostra vai para o medidor
+        # que estava ativo quando ela foi pressionada.
+        medidor = self.medidor
+        if medidor is None:
+            self._despachar_tecla(evt)
+            return
+        inicio = time.perf_counter()
+        self._despachar_tecla(evt)
+        medidor.registrar("tecla " + _nome_tecla(evt), time.perf_counter() - inicio)
+
+    def _despachar_tecla(self, evt):
+        code = evt.GetKeyCode()
+
+        if self._tratar_digitacao(evt, code):
+            return
+        if self._digitacao:
+            # Qualquer outra tecla confirma a data digitada e segue com a sua ação.
+            self._confirmar_digitacao()
+
+        if code == wx.WXK_ESCAPE:
+            self.Close()
+        elif code == wx.WXK_F1:
+            self.mostrar_ajuda()
+        elif code == wx.WXK_F12:
+            if evt.ShiftDown():
+                self.anunciar_tempos()
+            else:
+                self.alternar_medicao()
+        elif code == wx.WXK_RETURN or code == wx.WXK_NUMPAD_ENTER:
+            self.gerenciar_nota()
+        elif code in (ord("G"), ord("g")) and not evt.ControlDown() and not evt.AltDown():
+            self.dialogo_ir_para_data()
+        elif code in (ord("H"), ord("h")) and not evt.ControlDown() and not evt.AltDown():
+            self.currentDate = self.today
+            self.announce(mudou_contexto=False)
+        elif code in (ord("C"), ord("c")) and not evt.ControlDown() and not evt.AltDown():
+            self.copiar_data_clipboard()
+        elif code in (ord("D"), ord("d")) and not evt.ControlDown() and not evt.AltDown():
+            self.anunciar_dia_ano()
+        elif code in (ord("F"), ord("f")) and not evt.ControlDown() and not evt.AltDown():
+            self.anunciar_fase_lua_detalhada()
+        elif code in (ord("L"), ord("l")) and not evt.ControlDown() and not evt.AltDown():
+            self.mostrar_lista_feriados()
+        elif code in (ord("N"), ord("n")) and not evt.ControlDown() and not evt.AltDown():
+            self.ir_para_nota(-1 if evt.ShiftDown() else 1)
+        elif code in (ord("B"), ord("b")) and not evt.ControlDown() and not evt.AltDown():
+            self.buscar_notas()
+        elif code in (ord("M"), ord("m")) and not evt.ControlDown() and not evt.AltDown():
+            self.escolher_localidade()
+        elif code in (ord("E"), ord("e")) and not evt.ControlDown() and not evt.AltDown():
+            self.exportar_calendario()
+        elif code in (ord("I"), ord("i")) and not evt.ControlDown() and not evt.AltDown():
+            self.importar_calendario()
+        elif code in (ord("U"), ord("u")) and not evt.ControlDown() and not evt.AltDown():
+            if evt.ShiftDown():
+                self.anunciar_dias_uteis()
+            else:
+                self.marcar_inicio_dias_uteis()
+        elif code in (ord("P"), ord("p")) and not evt.ControlDown() and not evt.AltDown():
+            self.dialogo_somar_dias_uteis()
+        elif code in (ord("R"), ord("r")) and not evt.ControlDown() and not evt.AltDown():
+            self.ir_para_feriado(-1 if evt.ShiftDown() else 1)
+        elif code == wx.WXK_LEFT:
+            self.move_safe(-1)
+        elif code == wx.WXK_RIGHT:
+            self.move_safe(1)
+        elif code == wx.WXK_UP:
+            self.move_safe(-7)
+        elif code == wx.WXK_DOWN:
+            self.move_safe(7)
+        elif code == wx.WXK_PAGEUP:
+            self.add_months(-1)
+            self.announce(mudou_contexto=True)
+        elif code == wx.WXK_PAGEDOWN:
+            self.add_months(1)
+            self.announce(mudou_contexto=True)
+        elif code == wx.WXK_HOME:
+            if evt.ControlDown():
+                self.add_years(-1)
+                self.announce(mudou_contexto=True)
+            else:
+                self.currentDate = self.currentDate.replace(day=1)
+                self.announce()
+        elif code == wx.WXK_END:
+            if evt.ControlDown():
+                self.add_years(1)
+                self.announce(mudou_contexto=True)
+            else:
+                ultimo_dia = calendar.monthrange(self.currentDate.year, self.currentDate.month)[1]
+                self.currentDate = self.currentDate.replace(day=ultimo_dia)
+                self.announce()
+        else:
+            evt.Skip()
+
+    def add_months(self, delta):
+        tones.beep(550, 70)
+        m = self.currentDate.month - 1 + delta
+        y = self.currentDate.year + m // 12
+        m = m % 12 + 1
+        d = 1
+        self.currentDate = datetime.date(y, m, d)
+
+    def add_years(self, delta):
+        tones.beep(440, 150)
+        y = self.currentDate.year + delta
+        m = self.currentDate.month
+        d = min(self.currentDate.day, calendar.monthrange(y, m)[1])
+        self.currentDate = datetime.date(y, m, d)
+
+
+# --- ABERTURA ---
+def abrir_calendario(parent):
+    """Traz para frente o calendário já aberto, reexibe o escondido ou cria um novo."""
+    inicio = time.perf_counter()
+    for child in parent.GetChildren():
+        if isinstance(child, CalendarioFrame):
+            if child.IsShown():
+                child.Raise()
+                child.panel.SetFocus()
+            else:
+                child.reabrir(inicio)
+            return
+    CalendarioFrame(parent, inicio)
+
+
+def encerrar(parent):
+    """Fecha as janelas do calendário (inclusive as escondidas) e descarrega as notas."""
+    if parent is not None:
+        for child in parent.GetChildren():
+            if isinstance(child, CalendarioFrame):
+                child.encerrar()
+    encerrar_gravadores()
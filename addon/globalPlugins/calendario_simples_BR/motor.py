@@ -0,0 +1,1005 @@
+# -*- coding: utf-8 -*-
+"""Motor do calendário: feriados, fases da lua, dias úteis, textos de data e iCalendar.
+
+Não depende do NVDA nem do wx, então pode ser usado fora do leitor de telas
+(ver tools/calendario_lote.py). Dentro do NVDA, calendario.py troca `log`
+pelo logger do NVDA.
+"""
+import bisect
+import calendar
+import datetime
+import functools
+import heapq
+import logging
+import math
+import mmap
+import os
+import struct
+import sys
+import time
+from array import array
+
+try:
+    import numpy as _numpy
+except ImportError:
+    _numpy = None
+
+log = logging.getLogger("calendario_simples_BR")
+
+# --- CONSTANTES E DADOS ---
+DIAS_SEMANA = ["Segunda-feira", "Terça-feira", "Quarta-feira", "Quinta-feira", "Sexta-feira", "Sábado", "Domingo"]
+DIAS_ABREV = ["Seg", "Ter", "Qua", "Qui", "Sex", "Sáb", "Dom"]
+MESES = ["janeiro", "fevereiro", "março", "abril", "maio", "junho", "julho", "agosto", "setembro", "outubro", "novembro", "dezembro"]
+
+FERIADOS_FIXOS = {
+    (1, 1): "Confraternização Universal",
+    (21, 4): "Tiradentes",
+    (1, 5): "Dia do Trabalho",
+    (7, 9): "Independência do Brasil",
+    (12, 10): "Nossa Senhora Aparecida",
+    (2, 11): "Finados",
+    (15, 11): "Proclamação da República",
+    (20, 11): "Dia da Consciência Negra",
+    (25, 12): "Natal",
+}
+
+# Tabela de fases da lua gerada por tools/gerar_fases_lua.py durante o build.
+ARQUIVO_FASES_LUA = os.path.join(os.path.dirname(__file__), "fases_lua.bin")
+
+# Feriados estaduais e municipais gerados por tools/gerar_feriados_locais.py durante o build.
+ARQUIVO_FERIADOS_LOCAIS = os.path.join(os.path.dirname(__file__), "feriados_locais.bin")
+
+# Códigos IBGE das UFs.
+UFS = {
+    "RO": 11, "AC": 12, "AM": 13, "RR": 14, "PA": 15, "AP": 16, "TO": 17,
+    "MA": 21, "PI": 22, "CE": 23, "RN": 24, "PB": 25, "PE": 26, "AL": 27, "SE": 28, "BA": 29,
+    "MG": 31, "ES": 32, "RJ": 33, "SP": 35,
+    "PR": 41, "SC": 42, "RS": 43,
+    "MS": 50, "MT": 51, "GO": 52, "DF": 53,
+}
+
+
+# --- FUNÇÕES AUXILIARES ---
+# Deslocamento, em dias, de cada feriado móvel em relação à Páscoa.
+DESLOCAMENTOS_MOVEIS = (
+    ("Carnaval", -47),
+    ("Sexta-feira Santa", -2),
+    ("Páscoa", 0),
+    ("Corpus Christi", 60),
+)
+
+
+def _pascoa_ordinal(ano):
+    """Ordinal (date.toordinal) da Páscoa.
+
+    Usa apenas aritmética inteira, então aceita tanto um int quanto um array
+    NumPy de anos.
+    """
+    a = ano % 19
+    b = ano // 100
+    c = ano % 100
+    d = b // 4
+    e = b % 4
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i = c // 4
+    k = c % 4
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    # Dias contados a partir de 1º de março (a Páscoa cai entre 22/03 e 25/04).
+    dias_desde_marco = h + l - 7 * m + 21
+    primeiro_marco = 365 * ano + ano // 4 - ano // 100 + ano // 400 - 305
+    return primeiro_marco + dias_desde_marco
+
+
+def get_feriados_moveis(ano):
+    """Calcula feriados móveis baseados na data da Páscoa."""
+    pascoa = datetime.date.fromordinal(_pascoa_ordinal(ano))
+
+    return {pascoa + datetime.timedelta(days=desloc): nome for nome, desloc in DESLOCAMENTOS_MOVEIS}
+
+
+class FeriadosMoveisLote(object):
+    """Feriados móveis de um intervalo de anos, guardados como ordinais da Páscoa."""
+
+    __slots__ = ("ano_inicio", "pascoa")
+
+    def __init__(self, ano_inicio, pascoa):
+        self.ano_inicio = ano_inicio
+        self.pascoa = pascoa
+
+    def __len__(self):
+        return len(self.pascoa)
+
+    def anos(self):
+        return range(self.ano_inicio, self.ano_inicio + len(self.pascoa))
+
+    def ordinais(self, nome):
+        """Array com o ordinal do feriado móvel `nome` em cada ano do intervalo."""
+        desloc = dict(DESLOCAMENTOS_MOVEIS)[nome]
+        if _numpy is not None and isinstance(self.pascoa, _numpy.ndarray):
+            return self.pascoa + desloc
+        return array("l", [o + desloc for o in self.pascoa])
+
+    def feriados(self, ano):
+        """Mesmo resultado de get_feriados_moveis(ano), sem recalcular a Páscoa."""
+        indice = ano - self.ano_inicio
+        if not 0 <= indice < len(self.pascoa):
+            raise IndexError("Ano {} fora do intervalo".format(ano))
+        pascoa = int(self.pascoa[indice])
+        return {datetime.date.fromordinal(pascoa + desloc): nome for nome, desloc in DESLOCAMENTOS_MOVEIS}
+
+    def linhas(self):
+        """Gera (ano, carnaval, sexta-feira santa, páscoa, corpus christi) como datas."""
+        for ano, pascoa in zip(self.anos(), self.pascoa):
+            pascoa = int(pascoa)
+            yield (ano,) + tuple(datetime.date.fromordinal(pascoa + desloc) for _, desloc in DESLOCAMENTOS_MOVEIS)
+
+
+def get_feriados_moveis_intervalo(ano_inicio, ano_fim, usar_numpy=None):
+    """Calcula os feriados móveis de ano_inicio a ano_fim (inclusive) de uma só vez.
+
+    Usa aritmética vetorizada do NumPy quando disponível; `usar_numpy=False`
+    força o caminho em Python puro, que produz os mesmos valores.
+    """
+    if ano_fim < ano_inicio:
+        raise ValueError("Intervalo de anos inválido: {} a {}".format(ano_inicio, ano_fim))
+    if usar_numpy is None:
+        usar_numpy = _numpy is not None
+    if usar_numpy:
+        if _numpy is None:
+            raise RuntimeError("NumPy não está disponível")
+        anos = _numpy.arange(ano_inicio, ano_fim + 1, dtype=_numpy.int64)
+        return FeriadosMoveisLote(ano_inicio, _pascoa_ordinal(anos))
+    return FeriadosMoveisLote(ano_inicio, array("l", map(_pascoa_ordinal, range(ano_inicio, ano_fim + 1))))
+
+
+class DadosFeriadosLocais(object):
+    """Feriados estaduais e municipais lidos direto do arquivo mapeado em memória.
+
+    O formato está descrito em tools/gerar_feriados_locais.py. Nada é
+    convertido na abertura: cada consulta faz uma busca binária nos códigos e
+    decodifica só os feriados da localidade pedida.
+    """
+
+    def __init__(self, caminho):
+        with open(caminho, "rb") as f:
+            self._mapa = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magico, self.num_localidades, num_feriados, num_textos = struct.unpack_from("<4sIII", self._mapa, 0)
+        if magico != b"CFL1":
+            self._mapa.close()
+            raise ValueError("Arquivo de feriados locais inválido")
+        self._codigos = 16
+        self._inicios = self._codigos + 4 * self.num_localidades
+        self._nomes_locais = self._inicios + 4 * (self.num_localidades + 1)
+        self._feriados = self._nomes_locais + 4 * self.num_localidades
+        self._offsets = self._feriados + 4 * num_feriados
+        self._textos = self._offsets + 4 * (num_textos + 1)
+
+    def _uint(self, base, indice):
+        return struct.unpack_from("<I", self._mapa, base + 4 * indice)[0]
+
+    def _texto(self, indice):
+        inicio = self._textos + self._uint(self._offsets, indice)
+        fim = self._textos + self._uint(self._offsets, indice + 1)
+        return self._mapa[inicio:fim].decode("utf-8")
+
+    def _posicao(self, codigo):
+        baixo, alto = 0, self.num_localidades
+        while baixo < alto:
+            meio = (baixo + alto) // 2
+            if self._uint(self._codigos, meio) < codigo:
+                baixo = meio + 1
+            else:
+                alto = meio
+        if baixo < self.num_localidades and self._uint(self._codigos, baixo) == codigo:
+            return baixo
+        return None
+
+    def nome(self, codigo):
+        """Nome da localidade, ou None se ela não tiver feriados próprios no arquivo."""
+        pos = self._posicao(codigo)
+        return None if pos is None else self._texto(self._uint(self._nomes_locais, pos))
+
+    def feriados(self, codigo):
+        """Feriados da própria localidade, como ((dia, mes), nome), em ordem de data."""
+        pos = self._posicao(codigo)
+        if pos is None:
+            return ()
+        resultado = []
+        for i in range(self._uint(self._inicios, pos), self._uint(self._inicios, pos + 1)):
+            valor = self._uint(self._feriados, i)
+            resultado.append((((valor >> 16) & 0xFF, valor >> 24), self._texto(valor & 0xFFFF)))
+        return tuple(resultado)
+
+    def fechar(self):
+        self._mapa.close()
+
+
+@functools.lru_cache(maxsize=1)
+def _abrir_feriados_locais():
+    """Arquivo de feriados locais aberto, ou None se indisponível."""
+    try:
+        return DadosFeriadosLocais(ARQUIVO_FERIADOS_LOCAIS)
+    except Exception as e:
+        log.error("CALENDARIO: Falha ao abrir feriados locais: {}".format(e))
+        return None
+
+
+def codigo_uf(localidade):
+    """Código da UF de uma localidade (a própria UF ou o município)."""
+    return localidade if localidade < 100 else localidade // 100000
+
+
+@functools.lru_cache(maxsize=4)
+def get_feriados_locais(localidade):
+    """Feriados da UF e, se `localidade` for um município, também os municipais."""
+    if not localidade:
+        return ()
+    dados = _abrir_feriados_locais()
+    if dados is None:
+        return ()
+    feriados = dados.feriados(codigo_uf(localidade))
+    if localidade >= 100:
+        feriados += dados.feriados(localidade)
+    return feriados
+
+
+def nome_localidade(localidade):
+    """Nome falado da localidade escolhida."""
+    dados = _abrir_feriados_locais()
+    nome = dados.nome(localidade) if dados is not None else None
+    if localidade >= 100:
+        return nome or "município {}".format(localidade)
+    sigla = next((s for s, c in UFS.items() if c == localidade), str(localidade))
+    return "{} ({})".format(nome, sigla) if nome else sigla
+
+
+def interpretar_localidade(texto):
+    """Código IBGE a partir de uma sigla de UF ou de um código de 2 ou 7 dígitos.
+
+    Devolve 0 para texto vazio (só feriados nacionais) e None se for inválido.
+    """
+    texto = texto.strip().upper()
+    if not texto:
+        return 0
+    if texto in UFS:
+        return UFS[texto]
+    if not texto.isdigit() or len(texto) not in (2, 7):
+        return None
+    codigo = int(texto)
+    return codigo if codigo_uf(codigo) in UFS.values() else None
+
+
+class IndiceFeriados(object):
+    """Feriados fixos, móveis e locais de um ano reunidos numa única tabela de consulta."""
+
+    __slots__ = ("ano", "por_data", "lista")
+
+    def __init__(self, ano, localidade=0):
+        self.ano = ano
+        todos = [(datetime.date(ano, mes, dia), nome) for (dia, mes), nome in FERIADOS_FIXOS.items()]
+        todos.extend(get_feriados_moveis(ano).items())
+        for (dia, mes), nome in get_feriados_locais(localidade):
+            if dia <= calendar.monthrange(ano, mes)[1]:
+                todos.append((datetime.date(ano, mes, dia), nome))
+        todos.sort(key=lambda x: x[0])
+
+        por_data = {}
+        for dt, nome in todos:
+            # O nacional prevalece ao ser anunciado: fixo, depois móvel (ex.: Páscoa em
+            # 21 de abril), depois estadual e municipal.
+            por_data.setdefault(dt, nome)
+
+        self.por_data = por_data
+        self.lista = tuple(todos)
+
+    def nome(self, dt):
+        """Nome do feriado na data, ou None."""
+        return self.por_data.get(dt)
+
+    def __contains__(self, dt):
+        return dt in self.por_data
+
+
+@functools.lru_cache(maxsize=8)
+def get_indice_feriados(ano, localidade=0):
+    """Índice de feriados do ano, construído uma vez e mantido em cache."""
+    return IndiceFeriados(ano, localidade)
+
+
+class SequenciaFeriados(object):
+    """Ordinais ordenados dos feriados de vários anos, estendidos sob demanda.
+
+    Os anos carregados são sempre contíguos; ao passar do fim (ou do início)
+    o ano seguinte (ou anterior) é acrescentado, então a busca por bisect vale
+    para qualquer distância.
+    """
+
+    def __init__(self, localidade=0):
+        self.localidade = localidade
+        self.ano_inicio = None
+        self.ano_fim = None
+        self.ordinais = array("l")
+        self.nomes = []
+
+    def _do_ano(self, ano):
+        por_data = IndiceFeriados(ano, self.localidade).por_data
+        datas = sorted(por_data)
+        return array("l", [dt.toordinal() for dt in datas]), [por_data[dt] for dt in datas]
+
+    def _garantir_ano(self, ano):
+        if self.ano_inicio is None:
+            self.ordinais, self.nomes = self._do_ano(ano)
+            self.ano_inicio = self.ano_fim = ano
+            return
+        while self.ano_fim < ano:
+            self.ano_fim += 1
+            ordinais, nomes = self._do_ano(self.ano_fim)
+            self.ordinais.extend(ordinais)
+            self.nomes.extend(nomes)
+        while self.ano_inicio > ano:
+            self.ano_inicio -= 1
+            ordinais, nomes = self._do_ano(self.ano_inicio)
+            ordinais.extend(self.ordinais)
+            self.ordinais = ordinais
+            self.nomes[:0] = nomes
+
+    def proximo(self, dt, passo):
+        """(data, nome) do próximo (passo > 0) ou anterior feriado, excluindo dt, ou None."""
+        self._garantir_ano(dt.year)
+        ordinal = dt.toordinal()
+        while True:
+            if passo > 0:
+                pos = bisect.bisect_right(self.ordinais, ordinal)
+                if pos < len(self.ordinais):
+                    break
+                if self.ano_fim >= datetime.MAXYEAR:
+                    return None
+                self._garantir_ano(self.ano_fim + 1)
+            else:
+                pos = bisect.bisect_left(self.ordinais, ordinal) - 1
+                if pos >= 0:
+                    break
+                if self.ano_inicio <= datetime.MINYEAR:
+                    return None
+                self._garantir_ano(self.ano_inicio - 1)
+        return datetime.date.fromordinal(self.ordinais[pos]), self.nomes[pos]
+
+
+@functools.lru_cache(maxsize=4)
+def get_sequencia_feriados(localidade=0):
+    return SequenciaFeriados(localidade)
+
+
+def _prefixo_dias_uteis(ano, localidade=0):
+    """Array em que a posição k é o número de dias úteis nos k primeiros dias do ano.
+
+    Dia útil: segunda a sexta que não seja feriado (nacional ou da localidade).
+    """
+    feriados = IndiceFeriados(ano, localidade).por_data
+    # Por ordinais, para não passar de 31/12 (que estoura em 9999).
+    primeiro = datetime.date(ano, 1, 1).toordinal()
+    prefixo = array("l", [0])
+    total = 0
+    for ordinal in range(primeiro, primeiro + (366 if calendar.isleap(ano) else 365)):
+        dt = datetime.date.fromordinal(ordinal)
+        if dt.weekday() < 5 and dt not in feriados:
+            total += 1
+        prefixo.append(total)
+    return prefixo
+
+
+class DiasUteis(object):
+    """Contagem e soma de dias úteis sobre somas prefixadas por ano.
+
+    Os anos são carregados sob demanda e mantidos contíguos; `acumulado[i]` é
+    o número de dias úteis antes de 1º de janeiro do i-ésimo ano carregado.
+    Contar é O(1); somar N dias úteis é uma busca binária, O(log n).
+    """
+
+    def __init__(self, localidade=0):
+        self.localidade = localidade
+        self.ano_base = None
+        self.prefixos = []
+        self.acumulado = array("l", [0])
+
+    def _garantir_ano(self, ano):
+        if not datetime.MINYEAR <= ano <= datetime.MAXYEAR:
+            raise OverflowError("Ano {} fora do calendário".format(ano))
+        if self.ano_base is None:
+            self.ano_base = ano
+            self._anexar(ano)
+            return
+        while ano >= self.ano_base + len(self.prefixos):
+            self._anexar(self.ano_base + len(self.prefixos))
+        if ano < self.ano_base:
+            novos = [_prefixo_dias_uteis(a, self.localidade) for a in range(ano, self.ano_base)]
+            self.prefixos[:0] = novos
+            self.ano_base = ano
+            acumulado = array("l", [0])
+            for prefixo in self.prefixos:
+                acumulado.append(acumulado[-1] + prefixo[-1])
+            self.acumulado = acumulado
+
+    def _anexar(self, ano):
+        prefixo = _prefixo_dias_uteis(ano, self.localidade)
+        self.prefixos.append(prefixo)
+        self.acumulado.append(self.acumulado[-1] + prefixo[-1])
+
+    def _ate(self, dt):
+        """Dias úteis desde o primeiro ano carregado até dt, inclusive."""
+        self._garantir_ano(dt.year)
+        i = dt.year - self.ano_base
+        return self.acumulado[i] + self.prefixos[i][dt.timetuple().tm_yday]
+
+    def eh_util(self, dt):
+        self._garantir_ano(dt.year)
+        prefixo = self.prefixos[dt.year - self.ano_base]
+        dia = dt.timetuple().tm_yday
+        return prefixo[dia] != prefixo[dia - 1]
+
+    def contar(self, inicio, fim):
+        """Dias úteis de inicio a fim, incluindo as duas pontas (em qualquer ordem)."""
+        if fim < inicio:
+            inicio, fim = fim, inicio
+        # Carrega primeiro o ano mais antigo, para que as duas contagens usem a mesma base.
+        self._garantir_ano(inicio.year)
+        return self._ate(fim) - self._ate(inicio) + (1 if self.eh_util(inicio) else 0)
+
+    def somar(self, dt, n):
+        """Data `n` dias úteis depois (ou antes, com n negativo) de dt; n = 0 devolve dt."""
+        if n == 0:
+            return dt
+        while True:
+            ate = self._ate(dt)
+            if n > 0:
+                posicao = ate + n
+            else:
+                posicao = ate - (1 if self.eh_util(dt) else 0) + n + 1
+            if posicao < 1:
+                self._garantir_ano(self.ano_base - 1)
+            elif posicao > self.acumulado[-1]:
+                self._garantir_ano(self.ano_base + len(self.prefixos))
+            else:
+                break
+        # Ano e dia do dia útil de número `posicao`, contado a partir do primeiro ano carregado.
+        i = bisect.bisect_left(self.acumulado, posicao) - 1
+        dia = bisect.bisect_left(self.prefixos[i], posicao - self.acumulado[i])
+        return datetime.date(self.ano_base + i, 1, 1) + datetime.timedelta(days=dia - 1)
+
+
+@functools.lru_cache(maxsize=4)
+def get_dias_uteis(localidade=0):
+    """Motor de dias úteis da localidade, reaproveitado entre consultas."""
+    return DiasUteis(localidade)
+
+
+def contar_dias_uteis(inicio, fim, localidade=0):
+    """Dias úteis de inicio a fim, incluindo as duas pontas."""
+    return get_dias_uteis(localidade).contar(inicio, fim)
+
+
+def somar_dias_uteis(dt, n, localidade=0):
+    """Data `n` dias úteis depois de dt (antes, se n for negativo)."""
+    return get_dias_uteis(localidade).somar(dt, n)
+
+
+# Lunação média, usada fora do período coberto pela tabela de fases.
+# Referência: Lua Nova em 6 de Janeiro de 2000
+LUA_NOVA_REF = datetime.date(2000, 1, 6)
+CICLO_LUNAR = 29.530588853
+
+FASES_LUA = (
+    "Lua Nova",
+    "Lua Crescente",
+    "Lua Cheia",
+    "Lua Minguante",
+)
+
+
+# Instantes da tabela: minutos (UTC) desde esta data; datas anunciadas no horário de Brasília.
+EPOCA_FASES_LUA = datetime.date(1900, 1, 1)
+FUSO_BRASILIA_MINUTOS = -180
+
+
+@functools.lru_cache(maxsize=1)
+def _carregar_tabela_fases_lua():
+    """Carrega os instantes das fases (uint32 little-endian), ou None se indisponível."""
+    try:
+        tabela = array("I")
+        with open(ARQUIVO_FASES_LUA, "rb") as f:
+            tabela.frombytes(f.read())
+        if sys.byteorder != "little":
+            tabela.byteswap()
+        return tabela
+    except Exception as e:
+        log.error("CALENDARIO: Falha ao carregar tabela de fases da lua: {}".format(e))
+        return None
+
+
+def _posicao_fase_lua(data_dt):
+    """Índice, na tabela, da última fase iniciada até o fim do dia, ou None fora da tabela."""
+    tabela = _carregar_tabela_fases_lua()
+    if not tabela:
+        return None
+    fim_do_dia = ((data_dt - EPOCA_FASES_LUA).days + 1) * 1440 - FUSO_BRASILIA_MINUTOS
+    pos = bisect.bisect_left(tabela, fim_do_dia) - 1
+    if pos < 0 or pos + 1 >= len(tabela):
+        return None
+    return pos
+
+
+def _data_local_fase(minutos):
+    return EPOCA_FASES_LUA + datetime.timedelta(minutes=minutos + FUSO_BRASILIA_MINUTOS)
+
+
+def _indice_fase_lua(dias_passados):
+    lunacao = dias_passados % CICLO_LUNAR
+    return int((lunacao / CICLO_LUNAR) * 4) % 4
+
+
+def get_fase_lua_nome(data_dt):
+    """Calcula a fase da lua simplificada (Nova, Crescente, Cheia, Minguante)."""
+    pos = _posicao_fase_lua(data_dt)
+    if pos is not None:
+        return FASES_LUA[pos % 4]
+    return FASES_LUA[_indice_fase_lua((data_dt - LUA_NOVA_REF).days)]
+
+
+def get_intervalo_fase_lua(data_dt):
+    """Primeiro e último dia da fase da lua em que data_dt está.
+
+    Dentro da tabela de fases é uma busca binária; fora dela, os limites saem
+    direto da fração da lunação média, sem percorrer os dias um a um.
+    """
+    pos = _posicao_fase_lua(data_dt)
+    if pos is not None:
+        tabela = _carregar_tabela_fases_lua()
+        return (
+            _data_local_fase(tabela[pos]),
+            _data_local_fase(tabela[pos + 1]) - datetime.timedelta(days=1),
+        )
+    return _get_intervalo_fase_lua_media(data_dt)
+
+
+def _get_intervalo_fase_lua_media(data_dt):
+    dias = (data_dt - LUA_NOVA_REF).days
+    indice = _indice_fase_lua(dias)
+    quarto = CICLO_LUNAR / 4
+    inicio_fase = (dias // CICLO_LUNAR) * CICLO_LUNAR + indice * quarto
+
+    inicio = math.ceil(inicio_fase)
+    fim = math.ceil(inicio_fase + quarto) - 1
+    # Corrige arredondamentos de ponto flutuante na fronteira (no máximo um dia).
+    while inicio > dias or _indice_fase_lua(inicio - 1) == indice:
+        inicio -= 1
+    while _indice_fase_lua(inicio) != indice:
+        inicio += 1
+    while fim < dias or _indice_fase_lua(fim + 1) == indice:
+        fim += 1
+    while _indice_fase_lua(fim) != indice:
+        fim -= 1
+
+    return (
+        LUA_NOVA_REF + datetime.timedelta(days=inicio),
+        LUA_NOVA_REF + datetime.timedelta(days=fim),
+    )
+
+
+class FrasesMes(object):
+    """Textos de cada dia de um mês, montados uma vez e indexados por (dia - 1)."""
+
+    __slots__ = ("data_pt", "dia_mes", "prefixo_lista")
+
+    def __init__(self, ano, mes):
+        nome_mes = MESES[mes - 1]
+        num_dias = calendar.monthrange(ano, mes)[1]
+        semana = datetime.date(ano, mes, 1).weekday()
+        data_pt = []
+        dia_mes = []
+        prefixo_lista = []
+        for dia in range(1, num_dias + 1):
+            dia_semana = (semana + dia - 1) % 7
+            data_pt.append("{} {} de {} de {}".format(DIAS_SEMANA[dia_semana], dia, nome_mes, ano))
+            dia_mes.append("{} de {}".format(dia, nome_mes))
+            prefixo_lista.append("{:02d}/{:02d} ({}): ".format(dia, mes, DIAS_ABREV[dia_semana]))
+        self.data_pt = tuple(data_pt)
+        self.dia_mes = tuple(dia_mes)
+        self.prefixo_lista = tuple(prefixo_lista)
+
+
+@functools.lru_cache(maxsize=16)
+def get_frases_mes(ano, mes):
+    return FrasesMes(ano, mes)
+
+
+def formato_data_pt(dt):
+    return get_frases_mes(dt.year, dt.month).data_pt[dt.day - 1]
+
+
+def formato_dia_mes(dt):
+    """Formato curto apenas com dia e mês para o intervalo."""
+    return get_frases_mes(dt.year, dt.month).dia_mes[dt.day - 1]
+
+
+def resolver_data_digitada(texto, base, completa=False):
+    """Data indicada por uma digitação parcial, completada com `base`, ou None.
+
+    "15" é o dia 15 do mês de `base`; "15/3", o dia 15 de março do ano de
+    `base`; "15/3/2027" é a data completa; "2027" mantém dia e mês de `base`
+    nesse ano (o dia é limitado ao fim do mês). Ano com menos de 4 dígitos
+    ainda está sendo digitado e é ignorado; com `completa` (digitação
+    encerrada), um ano de 2 dígitos fica no século de `base` ("15/3/27" é
+    15/03/2027) e um de 1 ou 3 dígitos torna a data inválida.
+    """
+    partes = texto.split("/")
+    if len(partes) > 3 or not all(p.isdigit() for p in partes if p) or not partes[0]:
+        return None
+    if len(partes) == 1 and len(partes[0]) == 4:
+        ano = int(partes[0])
+        if not datetime.MINYEAR <= ano <= datetime.MAXYEAR:
+            return None
+        return datetime.date(ano, base.month, min(base.day, calendar.monthrange(ano, base.month)[1]))
+    if len(partes[0]) > 2:
+        return None
+    dia = int(partes[0])
+    mes = int(partes[1]) if len(partes) > 1 and partes[1] else base.month
+    digitos_ano = len(partes[2]) if len(partes) > 2 else 0
+    if digitos_ano == 4:
+        ano = int(partes[2])
+    elif digitos_ano and completa:
+        if digitos_ano != 2:
+            return None
+        ano = base.year // 100 * 100 + int(partes[2])
+    else:
+        ano = base.year
+    try:
+        return datetime.date(ano, mes, dia)
+    except ValueError:
+        return None
+
+
+def chave_nota(dt):
+    """Chave de uma data no armazenamento de notas."""
+    return dt.strftime("%Y-%m-%d")
+
+
+def data_da_chave(chave):
+    """Data de uma chave de nota, ou None se a chave não estiver no formato esperado."""
+    try:
+        return datetime.date(int(chave[:4]), int(chave[5:7]), int(chave[8:10]))
+    except (ValueError, TypeError):
+        return None
+
+
+class VisaoMes(object):
+    """Fatos de um mês já calculados, compartilhados por grade, fala e listas.
+
+    Imutável: cada campo por dia é uma tupla indexada por (dia - 1). Como a
+    máscara de notas faz parte da chave do cache, a visão só é refeita quando
+    um dia do mês ganha ou perde nota.
+    """
+
+    __slots__ = (
+        "ano",
+        "mes",
+        "offset",
+        "num_dias",
+        "com_nota",
+        "dias_semana",
+        "feriados",
+        "fases",
+        "datas",
+        "falas",
+        "linhas_feriados",
+    )
+
+    def __init__(self, ano, mes, com_nota, localidade=0):
+        self.ano = ano
+        self.mes = mes
+        self.offset = datetime.date(ano, mes, 1).weekday()
+        self.num_dias = calendar.monthrange(ano, mes)[1]
+        self.com_nota = com_nota
+
+        feriados = [() for _ in range(self.num_dias)]
+        for dt, nome in get_indice_feriados(ano, localidade).lista:
+            if dt.month == mes:
+                feriados[dt.day - 1] += (nome,)
+
+        datas = [datetime.date(ano, mes, dia) for dia in range(1, self.num_dias + 1)]
+        self.dias_semana = tuple(dt.weekday() for dt in datas)
+        self.feriados = tuple(feriados)
+        self.fases = tuple(get_fase_lua_nome(dt) for dt in datas)
+
+        frases = get_frases_mes(ano, mes)
+        self.datas = frases.data_pt
+
+        falas = []
+        linhas_feriados = []
+        for indice, texto in enumerate(frases.data_pt):
+            extra_info = []
+            if self.feriados[indice]:
+                extra_info.append("Feriado: {}".format(self.feriados[indice][0]))
+                linhas_feriados.extend(frases.prefixo_lista[indice] + nome for nome in self.feriados[indice])
+            if self.tem_nota(indice + 1):
+                extra_info.append("Tem nota")
+            if extra_info:
+                texto += ". " + ". ".join(extra_info)
+            falas.append(texto)
+        self.falas = tuple(falas)
+        # Linhas "DD/MM (Sem): Nome" da lista de feriados.
+        self.linhas_feriados = tuple(linhas_feriados)
+
+    def tem_nota(self, dia):
+        return bool(self.com_nota & (1 << (dia - 1)))
+
+    def feriado(self, dia):
+        """Nome anunciado do feriado no dia (o fixo prevalece), ou None."""
+        nomes = self.feriados[dia - 1]
+        return nomes[0] if nomes else None
+
+
+@functools.lru_cache(maxsize=24)
+def get_visao_mes(ano, mes, com_nota=0, localidade=0):
+    """VisaoMes em cache; `com_nota` é a máscara de dias com nota do mês e
+    `localidade`, o código IBGE cujos feriados locais entram na visão."""
+    return VisaoMes(ano, mes, com_nota, localidade)
+
+
+# --- EXPORTAÇÃO ICS ---
+# Texto acumulado antes de cada escrita no arquivo exportado.
+TAMANHO_BLOCO_ICS = 64 * 1024
+PRODID_ICS = "-//calendario_simples_BR//Calendario Simples BR//PT"
+
+
+def _escapar_texto_ics(texto):
+    return (
+        texto.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def _dobrar_linha_ics(linha):
+    """Linha de conteúdo terminada em CRLF, dobrada a cada 75 octetos (RFC 5545, 3.1)."""
+    dados = linha.encode("utf-8")
+    if len(dados) <= 75:
+        return linha + "\r\n"
+    partes = []
+    inicio = 0
+    limite = 75
+    while inicio < len(dados):
+        fim = min(inicio + limite, len(dados))
+        # Não corta no meio de um caractere UTF-8 (bytes de continuação são 10xxxxxx).
+        while fim < len(dados) and (dados[fim] & 0xC0) == 0x80:
+            fim -= 1
+        partes.append(dados[inicio:fim].decode("utf-8"))
+        inicio = fim
+        # As linhas de continuação começam com um espaço, que conta no limite.
+        limite = 74
+    return "\r\n ".join(partes) + "\r\n"
+
+
+def _notas_no_intervalo(notas, inicio, fim):
+    """Gera (data, texto) das notas de inicio a fim, uma consulta ao índice por nota.
+
+    Usa só obter() e proxima_com_nota(), que podem ser chamados fora da
+    thread da interface.
+    """
+    dt = inicio
+    while dt is not None and dt <= fim:
+        texto = notas.obter(chave_nota(dt))
+        if texto:
+            yield dt, texto
+        dt = notas.proxima_com_nota(dt, 1)
+
+
+def _feriados_no_intervalo(inicio, fim, localidade=0):
+    """Gera (data, nome) dos feriados de inicio a fim, ano a ano."""
+    for ano in range(inicio.year, fim.year + 1):
+        for dt, nome in IndiceFeriados(ano, localidade).lista:
+            if inicio <= dt <= fim:
+                yield dt, nome
+
+
+def eventos_ics(inicio, fim, notas=None, localidade=0):
+    """Gera, em ordem de data, tuplas (data, tipo, resumo, descrição) a exportar.
+
+    `tipo` é "feriado" ou "nota". Nada é acumulado: feriados e notas são
+    intercalados à medida que são lidos.
+    """
+    feriados = ((dt, "feriado", nome, None) for dt, nome in _feriados_no_intervalo(inicio, fim, localidade))
+    if notas is None:
+        return feriados
+    notas_dia = (
+        (dt, "nota", texto.strip().split("\n", 1)[0], texto) for dt, texto in _notas_no_intervalo(notas, inicio, fim)
+    )
+    return heapq.merge(feriados, notas_dia, key=lambda evento: evento[0])
+
+
+def linhas_ics(eventos, carimbo=None):
+    """Gera as linhas (já dobradas e com CRLF) de um VCALENDAR com os eventos dados."""
+    carimbo = carimbo or datetime.datetime.now(datetime.timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    yield "BEGIN:VCALENDAR\r\n"
+    yield "VERSION:2.0\r\n"
+    yield "PRODID:{}\r\n".format(PRODID_ICS)
+    yield "CALSCALE:GREGORIAN\r\n"
+    # Numeração por (data, tipo): uma nota não muda o UID dos feriados do dia.
+    numeros_no_dia = {}
+    dia_anterior = None
+    for dt, tipo, resumo, descricao in eventos:
+        if dt != dia_anterior:
+            numeros_no_dia.clear()
+            dia_anterior = dt
+        numero = numeros_no_dia.get(tipo, 0)
+        numeros_no_dia[tipo] = numero + 1
+        yield "BEGIN:VEVENT\r\n"
+        yield "UID:{}-{}-{}@calendario_simples_BR\r\n".format(dt.strftime("%Y%m%d"), tipo, numero)
+        yield "DTSTAMP:{}\r\n".format(carimbo)
+        yield "DTSTART;VALUE=DATE:{}\r\n".format(dt.strftime("%Y%m%d"))
+        yield "DURATION:P1D\r\n"
+        yield _dobrar_linha_ics("SUMMARY:" + _escapar_texto_ics(resumo))
+        if descricao:
+            yield _dobrar_linha_ics("DESCRIPTION:" + _escapar_texto_ics(descricao))
+        yield "CATEGORIES:{}\r\n".format("Feriado" if tipo == "feriado" else "Nota")
+        yield "TRANSP:TRANSPARENT\r\n"
+        yield "END:VEVENT\r\n"
+    yield "END:VCALENDAR\r\n"
+
+
+def exportar_ics(caminho, inicio, fim, notas=None, localidade=0):
+    """Grava feriados (e notas) de inicio a fim em `caminho`; devolve o número de eventos.
+
+    O arquivo é escrito em blocos de TAMANHO_BLOCO_ICS caracteres, então a
+    memória usada não depende do tamanho do intervalo.
+    """
+    contagem = [0]
+
+    def contar(eventos):
+        for evento in eventos:
+            contagem[0] += 1
+            yield evento
+
+    inicio_exportacao = time.perf_counter()
+    with open(caminho, "w", encoding="utf-8", newline="") as f:
+        bloco = []
+        tamanho = 0
+        for linha in linhas_ics(contar(eventos_ics(inicio, fim, notas, localidade))):
+            bloco.append(linha)
+            tamanho += len(linha)
+            if tamanho >= TAMANHO_BLOCO_ICS:
+                f.write("".join(bloco))
+                bloco = []
+                tamanho = 0
+        f.write("".join(bloco))
+    duracao = time.perf_counter() - inicio_exportacao
+    log.info(
+        "CALENDARIO: {} eventos exportados para {} em {:.3f} s ({:.0f} eventos/s).".format(
+            contagem[0], caminho, duracao, contagem[0] / duracao if duracao > 0 else 0
+        )
+    )
+    return contagem[0]
+
+
+# --- IMPORTAÇÃO ICS ---
+
+def _desescapar_texto_ics(texto):
+    partes = texto.split("\\\\")
+    for i, parte in enumerate(partes):
+        partes[i] = parte.replace("\\n", "\n").replace("\\N", "\n").replace("\\,", ",").replace("\\;", ";")
+    return "\\".join(partes)
+
+
+def _separar_propriedade(linha):
+    """(NOME, {PARAMETRO: valor}, valor) de uma linha de conteúdo já desdobrada."""
+    aspas = False
+    for i, caractere in enumerate(linha):
+        if caractere == '"':
+            aspas = not aspas
+        elif caractere == ":" and not aspas:
+            cabeca, valor = linha[:i], linha[i + 1:]
+            break
+    else:
+        return None, {}, ""
+    partes = cabeca.split(";")
+    parametros = {}
+    for parte in partes[1:]:
+        nome, _, conteudo = parte.partition("=")
+        parametros[nome.upper()] = conteudo.strip('"')
+    return partes[0].upper(), parametros, valor
+
+
+def _data_evento_ics(valor):
+    """Data (no horário de Brasília, se o valor estiver em UTC) de um DTSTART."""
+    data = datetime.date(int(valor[0:4]), int(valor[4:6]), int(valor[6:8]))
+    if len(valor) >= 15 and valor[8] == "T" and valor.endswith("Z"):
+        instante = datetime.datetime(data.year, data.month, data.day, int(valor[9:11]), int(valor[11:13]))
+        data = (instante + datetime.timedelta(minutes=FUSO_BRASILIA_MINUTOS)).date()
+    return data
+
+
+def linhas_desdobradas_ics(linhas):
+    """Junta as linhas de continuação (iniciadas por espaço ou tab) à linha anterior."""
+    atual = None
+    for linha in linhas:
+        linha = linha.rstrip("\r\n")
+        if linha[:1] in (" ", "\t") and atual is not None:
+            atual += linha[1:]
+            continue
+        if atual is not None:
+            yield atual
+        atual = linha
+    if atual:
+        yield atual
+
+
+def ler_eventos_ics(linhas):
+    """Gera (data, texto) de cada VEVENT, lendo as linhas uma a uma.
+
+    O texto é o SUMMARY seguido da DESCRIPTION, sem repetir a primeira linha
+    quando a descrição já começa por ela (como nos arquivos exportados aqui).
+    Os feriados exportados por este complemento são ignorados.
+    """
+    componentes = []
+    evento = None
+    for linha in linhas_desdobradas_ics(linhas):
+        nome, parametros, valor = _separar_propriedade(linha)
+        if nome == "BEGIN":
+            componentes.append(valor.upper())
+            if valor.upper() == "VEVENT":
+                evento = {}
+            continue
+        if nome == "END":
+            if componentes:
+                componentes.pop()
+            if valor.upper() == "VEVENT" and evento is not None:
+                item = _evento_para_nota(evento)
+                evento = None
+                if item is not None:
+                    yield item
+            continue
+        if evento is not None and componentes and componentes[-1] == "VEVENT":
+            if nome in ("DTSTART", "SUMMARY", "DESCRIPTION", "UID"):
+                evento[nome] = valor
+
+
+def _evento_para_nota(evento):
+    uid = evento.get("UID", "")
+    if uid.endswith("@calendario_simples_BR") and "-feriado-" in uid:
+        return None
+    try:
+        data = _data_evento_ics(evento["DTSTART"].strip())
+    except (KeyError, ValueError, IndexError):
+        return None
+    resumo = _desescapar_texto_ics(evento.get("SUMMARY", "")).strip()
+    descricao = _desescapar_texto_ics(evento.get("DESCRIPTION", "")).strip()
+    if descricao and (not resumo or descricao.startswith(resumo)):
+        texto = descricao
+    elif descricao:
+        texto = "{}\n{}".format(resumo, descricao)
+    else:
+        texto = resumo
+    if not texto:
+        return None
+    return data, texto
+
+
+def mesclar_nota(atual, textos):
+    """Acrescenta à nota `atual` os `textos` que ela ainda não contém.
+
+    A comparação é por linhas inteiras: um texto já está na nota quando suas
+    linhas aparecem nela, em sequência ("Reunião" não está contido em
+    "Reunião com Ana").
+    """
+    linhas = atual.split("\n") if atual else []
+    for texto in textos:
+        novas = texto.split("\n")
+        tamanho = len(novas)
+        if any(linhas[i:i + tamanho] == novas for i in range(len(linhas) - tamanho + 1)):
+            continue
+        linhas.extend(novas)
+    return "\n".join(linhas)
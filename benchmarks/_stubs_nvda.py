@@ -0,0 +1,67 @@
+"""Módulos mínimos do NVDA/wx para importar o complemento fora do NVDA.
+
+Só cobre o que o módulo do complemento usa ao ser importado; nenhuma janela
+é criada pelos benchmarks.
+"""
+
+import sys
+import tempfile
+import types
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+PASTA_PLUGINS = RAIZ / "addon" / "globalPlugins"
+
+
+class _Qualquer:
+	"""Objeto que aceita qualquer atributo ou chamada."""
+
+	def __init__(self, *args: object, **kwargs: object) -> None:
+		pass
+
+	def __getattr__(self, nome: str) -> "_Qualquer":
+		return _Qualquer()
+
+	def __call__(self, *args: object, **kwargs: object) -> "_Qualquer":
+		return _Qualquer()
+
+
+def _modulo(nome: str, **atributos: object) -> types.ModuleType:
+	mod = types.ModuleType(nome)
+	mod.__dict__.update(atributos)
+	sys.modules[nome] = mod
+	return mod
+
+
+def instalar() -> None:
+	"""Registra os stubs em sys.modules e põe globalPlugins no sys.path."""
+	if "globalVars" in sys.modules:
+		return
+	wx = _modulo("wx", ID_CANCEL=5101, ID_OK=5100, ID_ANY=-1)
+	for classe in ("Dialog", "Frame", "Window", "Panel", "Timer", "Accessible"):
+		setattr(wx, classe, type(classe, (_Qualquer,), {}))
+	wx.__getattr__ = lambda nome: _Qualquer()  # type: ignore[attr-defined]
+
+	class _GlobalPlugin:
+		def __init__(self) -> None:
+			pass
+
+		def terminate(self) -> None:
+			pass
+
+	_modulo("addonHandler", initTranslation=lambda: None)
+	_modulo("globalPluginHandler", GlobalPlugin=_GlobalPlugin)
+	_modulo("globalVars", appArgs=types.SimpleNamespace(configPath=tempfile.mkdtemp()))
+	_modulo("gui", mainFrame=None)
+	_modulo("ui", message=lambda *a, **k: None)
+	_modulo("speech", cancelSpeech=lambda: None)
+	_modulo("tones", beep=lambda *a, **k: None)
+	_modulo("api", copyToClip=lambda texto: True)
+
+	import logging
+
+	_modulo("logHandler", log=logging.getLogger("calendario_simples_BR"))
+	_modulo("scriptHandler", script=lambda **k: (lambda f: f))
+
+	if str(PASTA_PLUGINS) not in sys.path:
+		sys.path.insert(0, str(PASTA_PLUGINS))
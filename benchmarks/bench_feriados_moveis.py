@@ -0,0 +1,47 @@
+"""Compara get_feriados_moveis ano a ano com o cálculo em lote.
+
+Uso: python benchmarks/bench_feriados_moveis.py [ano_inicio] [ano_fim]
+"""
+
+import sys
+import timeit
+
+import _stubs_nvda
+
+_stubs_nvda.instalar()
+
+from calendario_simples_BR import motor as cal  # noqa: E402
+
+
+def _por_ano(inicio: int, fim: int) -> list[dict[object, str]]:
+	return [cal.get_feriados_moveis(ano) for ano in range(inicio, fim + 1)]
+
+
+def main() -> None:
+	inicio = int(sys.argv[1]) if len(sys.argv) > 1 else 1900
+	fim = int(sys.argv[2]) if len(sys.argv) > 2 else 2100
+
+	puro = cal.get_feriados_moveis_intervalo(inicio, fim, usar_numpy=False)
+	for ano in puro.anos():
+		assert puro.feriados(ano) == cal.get_feriados_moveis(ano), ano
+
+	casos = [
+		("get_feriados_moveis por ano", lambda: _por_ano(inicio, fim)),
+		("lote (Python puro)", lambda: cal.get_feriados_moveis_intervalo(inicio, fim, usar_numpy=False)),
+	]
+	if cal._numpy is not None:
+		vetorizado = cal.get_feriados_moveis_intervalo(inicio, fim, usar_numpy=True)
+		assert list(vetorizado.pascoa) == list(puro.pascoa)
+		casos.append(("lote (NumPy)", lambda: cal.get_feriados_moveis_intervalo(inicio, fim, usar_numpy=True)))
+
+	print(f"Anos {inicio}-{fim} ({fim - inicio + 1} anos)")
+	base = None
+	for nome, funcao in casos:
+		repeticoes, total = timeit.Timer(funcao).autorange()
+		por_chamada = total / repeticoes
+		base = base or por_chamada
+		print(f"{nome:32} {por_chamada * 1e3:9.3f} ms  ({base / por_chamada:5.1f}x)")
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,54 @@
+"""Mede o custo de importação do complemento na inicialização do NVDA.
+
+Compara o pacote (o que o NVDA importa ao iniciar) com o submódulo do
+calendário (importado só na primeira abertura). Cada medição roda num
+interpretador novo para não aproveitar módulos já carregados.
+
+Uso: python benchmarks/bench_importacao.py [repeticoes]
+"""
+
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+PASTA = Path(__file__).resolve().parent
+
+_MEDIR = """
+import time, _stubs_nvda
+_stubs_nvda.instalar()
+inicio = time.perf_counter()
+import {modulo}
+print(time.perf_counter() - inicio)
+"""
+
+
+def medir(modulo: str, repeticoes: int) -> list[float]:
+	tempos: list[float] = []
+	for _ in range(repeticoes):
+		saida = subprocess.run(
+			[sys.executable, "-c", _MEDIR.format(modulo=modulo)],
+			cwd=PASTA,
+			capture_output=True,
+			text=True,
+			check=True,
+		)
+		tempos.append(float(saida.stdout.strip()))
+	return tempos
+
+
+def main() -> None:
+	repeticoes = int(sys.argv[1]) if len(sys.argv) > 1 else 15
+	for rotulo, modulo in (
+		("inicialização (pacote)", "calendario_simples_BR"),
+		("primeira abertura (+ calendario)", "calendario_simples_BR.calendario"),
+	):
+		tempos = medir(modulo, repeticoes)
+		print(
+			f"{rotulo:34} mediana {statistics.median(tempos) * 1e3:7.2f} ms"
+			f"  mín {min(tempos) * 1e3:7.2f} ms"
+		)
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,189 @@
+"""Suíte de benchmarks do motor do calendário e do armazenamento de notas.
+
+Roda fora do NVDA (com os stubs de _stubs_nvda) e compara cada caso com
+baseline.json: um caso mais lento que `mediana_ms * tolerancia` é uma
+regressão e faz o script terminar com código 1. Os tempos dependem da
+máquina, então a baseline deve ser regravada (--gravar) na máquina de
+referência sempre que um ganho ou custo for intencional.
+
+Uso: python benchmarks/bench_suite.py [--gravar] [--json] [--filtro TEXTO] [--amostras N]
+"""
+
+import argparse
+import datetime
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import timeit
+from collections.abc import Callable, Iterator
+from pathlib import Path
+
+import _stubs_nvda
+
+_stubs_nvda.instalar()
+
+from calendario_simples_BR import calendario as cal  # noqa: E402
+from calendario_simples_BR import motor  # noqa: E402
+
+PASTA = Path(__file__).resolve().parent
+ARQUIVO_BASELINE = PASTA / "baseline.json"
+TOLERANCIA_PADRAO = 1.5
+# Tempo mínimo de cada amostra; chamadas rápidas são repetidas até atingi-lo.
+DURACAO_AMOSTRA = 0.2
+
+ANO_INICIO_FERIADOS = 1583
+ANOS_FERIADOS = 3000
+TAMANHOS_NOTAS = (1_000, 10_000, 100_000)
+
+
+def _dias(ano: int) -> list[datetime.date]:
+	inicio = datetime.date(ano, 1, 1)
+	return [inicio + datetime.timedelta(days=i) for i in range((datetime.date(ano + 1, 1, 1) - inicio).days)]
+
+
+def _limpar_caches() -> None:
+	motor.get_visao_mes.cache_clear()
+	motor.get_indice_feriados.cache_clear()
+	motor.get_frases_mes.cache_clear()
+
+
+def _visao_fria(ano: int) -> None:
+	"""Os 12 meses do ano como o update_ui os monta num cache vazio."""
+	_limpar_caches()
+	for mes in range(1, 13):
+		motor.get_visao_mes(ano, mes, 0, 0)
+
+
+def _visao_em_cache(ano: int) -> None:
+	for mes in range(1, 13):
+		motor.get_visao_mes(ano, mes, 0, 0)
+
+
+def _notas_sinteticas(quantidade: int) -> dict[str, str]:
+	inicio = datetime.date(1990, 1, 1)
+	return {
+		motor.chave_nota(inicio + datetime.timedelta(days=i)): f"Nota sintética {i}: reunião, consulta e lembrete"
+		for i in range(quantidade)
+	}
+
+
+def _casos_notas(pasta: Path) -> Iterator[tuple[str, Callable[[], object]]]:
+	for quantidade in TAMANHOS_NOTAS:
+		rotulo = f"{quantidade // 1000}k"
+		caminho = pasta / f"notas_{rotulo}.json"
+		diario = pasta / f"notas_{rotulo}.diario"
+		with open(caminho, "w", encoding="utf-8") as f:
+			json.dump(_notas_sinteticas(quantidade), f, ensure_ascii=False)
+
+		def carregar(caminho: Path = caminho, diario: Path = diario) -> object:
+			armazem = cal.ArmazemNotasJson(str(caminho), str(diario))
+			armazem.carregar()
+			return armazem
+
+		yield f"notas_json_carregar_{rotulo}", carregar
+		yield f"notas_json_salvar_{rotulo}", carregar().salvar
+
+
+def casos(pasta: Path) -> Iterator[tuple[str, Callable[[], object]]]:
+	anos = range(ANO_INICIO_FERIADOS, ANO_INICIO_FERIADOS + ANOS_FERIADOS)
+	yield "feriados_moveis_3000_anos", lambda: [motor.get_feriados_moveis(ano) for ano in anos]
+	yield (
+		"feriados_moveis_lote_3000_anos",
+		lambda: motor.get_feriados_moveis_intervalo(anos[0], anos[-1], usar_numpy=False),
+	)
+
+	# 2026 está na tabela de fases; 2300 usa a lunação média.
+	for rotulo, ano in (("tabela", 2026), ("media", 2300)):
+		dias = _dias(ano)
+		yield f"fase_lua_{rotulo}_365_dias", lambda dias=dias: [motor.get_fase_lua_nome(d) for d in dias]
+		yield f"intervalo_fase_lua_{rotulo}_365_dias", lambda dias=dias: [motor.get_intervalo_fase_lua(d) for d in dias]
+
+	yield "visao_mes_fria_12_meses", lambda: _visao_fria(2026)
+	yield "visao_mes_em_cache_12_meses", lambda: _visao_em_cache(2026)
+
+	yield from _casos_notas(pasta)
+
+
+def medir(funcao: Callable[[], object], amostras: int) -> float:
+	"""Mediana, em milissegundos, do tempo de uma chamada."""
+	funcao()
+	timer = timeit.Timer(funcao)
+	numero = 1
+	while True:
+		duracao = timer.timeit(numero)
+		if duracao >= DURACAO_AMOSTRA:
+			break
+		numero *= 2
+	tempos = [duracao / numero] + [timer.timeit(numero) / numero for _ in range(amostras - 1)]
+	return statistics.median(tempos) * 1e3
+
+
+def carregar_baseline() -> dict[str, dict[str, float]]:
+	if not ARQUIVO_BASELINE.exists():
+		return {}
+	with open(ARQUIVO_BASELINE, encoding="utf-8") as f:
+		return json.load(f)["casos"]
+
+
+def gravar_baseline(resultados: dict[str, float], anterior: dict[str, dict[str, float]]) -> None:
+	"""Atualiza os casos medidos; os demais (fora do --filtro) continuam como estavam."""
+	casos = dict(anterior)
+	for nome, mediana in resultados.items():
+		casos[nome] = {
+			"mediana_ms": round(mediana, 4),
+			"tolerancia": anterior.get(nome, {}).get("tolerancia", TOLERANCIA_PADRAO),
+		}
+	dados = {
+		"python": platform.python_version(),
+		"plataforma": f"{platform.system()} {platform.machine()}",
+		"casos": casos,
+	}
+	with open(ARQUIVO_BASELINE, "w", encoding="utf-8", newline="\n") as f:
+		json.dump(dados, f, ensure_ascii=False, indent="\t")
+		f.write("\n")
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument("--gravar", action="store_true", help="regrava baseline.json com os tempos medidos")
+	parser.add_argument("--json", action="store_true", help="escreve os resultados em JSON na saída padrão")
+	parser.add_argument("--filtro", default="", help="roda só os casos cujo nome contém o texto")
+	parser.add_argument("--amostras", type=int, default=5)
+	args = parser.parse_args()
+
+	baseline = carregar_baseline()
+	resultados: dict[str, float] = {}
+	relatorio = []
+	regressoes = 0
+	with tempfile.TemporaryDirectory() as pasta:
+		for nome, funcao in casos(Path(pasta)):
+			if args.filtro not in nome:
+				continue
+			mediana = medir(funcao, args.amostras)
+			resultados[nome] = mediana
+			referencia = baseline.get(nome)
+			if referencia is None:
+				situacao, razao = "novo", None
+			else:
+				razao = mediana / referencia["mediana_ms"]
+				regressao = razao > referencia["tolerancia"]
+				regressoes += regressao
+				situacao = "REGRESSÃO" if regressao else "ok"
+			relatorio.append({"caso": nome, "mediana_ms": mediana, "razao": razao, "situacao": situacao})
+			if not args.json:
+				comparacao = f"{razao:5.2f}x" if razao is not None else "    -"
+				print(f"{nome:38} {mediana:11.4f} ms  {comparacao}  {situacao}", flush=True)
+
+	if args.json:
+		json.dump(relatorio, sys.stdout, ensure_ascii=False, indent="\t")
+		print()
+	if args.gravar:
+		gravar_baseline(resultados, baseline)
+	elif regressoes:
+		sys.exit(f"{regressoes} caso(s) acima da tolerância da baseline.")
+
+
+if __name__ == "__main__":
+	main()
@@ -33,7 +33,7 @@ addon_info = AddonInfo(
 )
 
 pythonSources: list[str] = [
-	"addon/globalPlugins/calendario_simples_BR.py",
+	"addon/globalPlugins/calendario_simples_BR/*.py",
 ]
 
 i18nSources: list[str] = pythonSources + ["buildVars.py"]
@@ -0,0 +1,123 @@
+"""Anota datas em lote com o motor do calendário, sem NVDA nem wx.
+
+Lê da entrada padrão uma consulta por linha:
+
+	2026-12-25 ou 25/12/2026   uma data
+	2026                        todos os dias de um ano
+	2026-2030                   todos os dias de um intervalo de anos
+
+e escreve na saída padrão uma linha por dia, em JSON lines ou CSV, com o dia
+da semana, o feriado (nacional ou da localidade) e a fase da lua. Linhas
+inválidas são relatadas na saída de erro e ignoradas.
+
+Uso: python tools/calendario_lote.py [--formato json|csv] [--so-feriados] [--localidade SP|código IBGE]
+"""
+
+import argparse
+import csv
+import datetime
+import json
+import os
+import sys
+from collections.abc import Iterator
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "addon" / "globalPlugins" / "calendario_simples_BR"))
+
+import motor  # noqa: E402
+
+CAMPOS = ("data", "dia_semana", "feriado", "fase_lua", "texto")
+
+
+def interpretar_consulta(linha: str) -> tuple[datetime.date, datetime.date]:
+	"""Primeiro e último dia pedidos numa linha da entrada."""
+	if "/" in linha:
+		dia, mes, ano = (int(p) for p in linha.split("/"))
+		data = datetime.date(ano, mes, dia)
+		return data, data
+	partes = linha.split("-")
+	if len(partes) == 3:
+		data = datetime.date.fromisoformat(linha)
+		return data, data
+	if len(partes) in (1, 2) and all(p.isdigit() for p in partes):
+		inicio, fim = int(partes[0]), int(partes[-1])
+		if fim < inicio:
+			raise ValueError(linha)
+		return datetime.date(inicio, 1, 1), datetime.date(fim, 12, 31)
+	raise ValueError(linha)
+
+
+def anotar(inicio: datetime.date, fim: datetime.date, localidade: int) -> Iterator[dict[str, str | None]]:
+	"""Uma anotação por dia, montada mês a mês a partir da VisaoMes."""
+	ano, mes = inicio.year, inicio.month
+	while (ano, mes) <= (fim.year, fim.month):
+		visao = motor.get_visao_mes(ano, mes, 0, localidade)
+		primeiro = inicio.day if (ano, mes) == (inicio.year, inicio.month) else 1
+		ultimo = fim.day if (ano, mes) == (fim.year, fim.month) else visao.num_dias
+		for dia in range(primeiro, ultimo + 1):
+			yield {
+				"data": datetime.date(ano, mes, dia).isoformat(),
+				"dia_semana": motor.DIAS_SEMANA[visao.dias_semana[dia - 1]],
+				"feriado": visao.feriado(dia),
+				"fase_lua": visao.fases[dia - 1],
+				"texto": visao.datas[dia - 1],
+			}
+		ano, mes = (ano + 1, 1) if mes == 12 else (ano, mes + 1)
+
+
+def anotar_feriados(inicio: datetime.date, fim: datetime.date, localidade: int) -> Iterator[dict[str, str | None]]:
+	"""Só os dias com feriado, sem percorrer os demais."""
+	for ano in range(inicio.year, fim.year + 1):
+		for data, nome in motor.IndiceFeriados(ano, localidade).por_data.items():
+			if inicio <= data <= fim:
+				yield {
+					"data": data.isoformat(),
+					"dia_semana": motor.DIAS_SEMANA[data.weekday()],
+					"feriado": nome,
+					"fase_lua": motor.get_fase_lua_nome(data),
+					"texto": motor.formato_data_pt(data),
+				}
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument("--formato", choices=("json", "csv"), default="json")
+	parser.add_argument("--so-feriados", action="store_true", help="escreve apenas os dias com feriado")
+	parser.add_argument("--localidade", default="", help="sigla da UF ou código IBGE do município")
+	args = parser.parse_args()
+
+	localidade = motor.interpretar_localidade(args.localidade)
+	if localidade is None:
+		parser.error(f"localidade inválida: {args.localidade}")
+	gerar = anotar_feriados if args.so_feriados else anotar
+
+	sys.stdout.reconfigure(encoding="utf-8", newline="\n")
+	if args.formato == "csv":
+		escritor = csv.DictWriter(sys.stdout, fieldnames=CAMPOS, lineterminator="\n")
+		escritor.writeheader()
+		escrever = escritor.writerow
+	else:
+
+		def escrever(registro: dict[str, str | None]) -> None:
+			sys.stdout.write(json.dumps(registro, ensure_ascii=False) + "\n")
+
+	for num_linha, linha in enumerate(sys.stdin, 1):
+		linha = linha.strip()
+		if not linha or linha.startswith("#"):
+			continue
+		try:
+			inicio, fim = interpretar_consulta(linha)
+		except ValueError:
+			print(f"linha {num_linha}: entrada inválida: {linha}", file=sys.stderr)
+			continue
+		for registro in gerar(inicio, fim, localidade):
+			escrever(registro)
+
+
+if __name__ == "__main__":
+	try:
+		main()
+	except BrokenPipeError:
+		# Saída fechada antes do fim (ex.: "| head"): descarta o resto sem erro.
+		os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+		sys.exit(1)
@@ -0,0 +1,197 @@
+"""Gera a tabela de fases da lua usada pelo complemento.
+
+Calcula os instantes de Lua Nova, Quarto Crescente, Lua Cheia e Quarto
+Minguante pelo algoritmo do capítulo 49 de Jean Meeus, "Astronomical
+Algorithms" (2ª ed.), e grava-os como inteiros sem sinal de 32 bits
+little-endian: minutos desde 1900-01-01 00:00 UTC. O primeiro registro é
+sempre uma Lua Nova, então a fase de cada registro é o seu índice módulo 4.
+
+A diferença entre TT e UT (ΔT, alguns minutos no máximo de 1900 a 2100)
+é ignorada; a tabela é usada com precisão de dia.
+
+Uso: python tools/gerar_fases_lua.py <arquivo_saida>
+"""
+
+import math
+import sys
+from array import array
+
+ANO_INICIO = 1900
+ANO_FIM = 2100
+# Data juliana de 1900-01-01 00:00 UTC, origem dos minutos gravados.
+JD_EPOCA = 2415020.5
+# Data juliana de 2101-02-01, para cobrir o fim de 2100 com folga.
+JD_LIMITE = 2488465.5
+
+_TERMOS_NOVA = (
+	(-0.40720, 0, 0, 1, 0, 0),
+	(0.17241, 1, 1, 0, 0, 0),
+	(0.01608, 0, 0, 2, 0, 0),
+	(0.01039, 0, 0, 0, 2, 0),
+	(0.00739, 1, -1, 1, 0, 0),
+	(-0.00514, 1, 1, 1, 0, 0),
+	(0.00208, 2, 2, 0, 0, 0),
+	(-0.00111, 0, 0, 1, -2, 0),
+	(-0.00057, 0, 0, 1, 2, 0),
+	(0.00056, 1, 1, 2, 0, 0),
+	(-0.00042, 0, 0, 3, 0, 0),
+	(0.00042, 1, 1, 0, 2, 0),
+	(0.00038, 1, 1, 0, -2, 0),
+	(-0.00024, 1, -1, 2, 0, 0),
+	(-0.00017, 0, 0, 0, 0, 1),
+	(-0.00007, 0, 2, 1, 0, 0),
+	(0.00004, 0, 0, 2, -2, 0),
+	(0.00004, 0, 3, 0, 0, 0),
+	(0.00003, 0, 1, 1, -2, 0),
+	(0.00003, 0, 0, 2, 2, 0),
+	(-0.00003, 0, 1, 1, 2, 0),
+	(0.00003, 0, -1, 1, 2, 0),
+	(-0.00002, 0, -1, 1, -2, 0),
+	(-0.00002, 0, 1, 3, 0, 0),
+	(0.00002, 0, 0, 4, 0, 0),
+)
+
+_TERMOS_CHEIA = (
+	(-0.40614, 0, 0, 1, 0, 0),
+	(0.17302, 1, 1, 0, 0, 0),
+	(0.01614, 0, 0, 2, 0, 0),
+	(0.01043, 0, 0, 0, 2, 0),
+	(0.00734, 1, -1, 1, 0, 0),
+	(-0.00515, 1, 1, 1, 0, 0),
+	(0.00209, 2, 2, 0, 0, 0),
+	(-0.00111, 0, 0, 1, -2, 0),
+	(-0.00057, 0, 0, 1, 2, 0),
+	(0.00056, 1, 1, 2, 0, 0),
+	(-0.00042, 0, 0, 3, 0, 0),
+	(0.00042, 1, 1, 0, 2, 0),
+	(0.00038, 1, 1, 0, -2, 0),
+	(-0.00024, 1, -1, 2, 0, 0),
+	(-0.00017, 0, 0, 0, 0, 1),
+	(-0.00007, 0, 2, 1, 0, 0),
+	(0.00004, 0, 0, 2, -2, 0),
+	(0.00004, 0, 3, 0, 0, 0),
+	(0.00003, 0, 1, 1, -2, 0),
+	(0.00003, 0, 0, 2, 2, 0),
+	(-0.00003, 0, 1, 1, 2, 0),
+	(0.00003, 0, -1, 1, 2, 0),
+	(-0.00002, 0, -1, 1, -2, 0),
+	(-0.00002, 0, 1, 3, 0, 0),
+	(0.00002, 0, 0, 4, 0, 0),
+)
+
+_TERMOS_QUARTO = (
+	(-0.62801, 0, 0, 1, 0, 0),
+	(0.17172, 1, 1, 0, 0, 0),
+	(-0.01183, 1, 1, 1, 0, 0),
+	(0.00862, 0, 0, 2, 0, 0),
+	(0.00804, 0, 0, 0, 2, 0),
+	(0.00454, 1, -1, 1, 0, 0),
+	(0.00204, 2, 2, 0, 0, 0),
+	(-0.00180, 0, 0, 1, -2, 0),
+	(-0.00070, 0, 0, 1, 2, 0),
+	(-0.00040, 0, 0, 3, 0, 0),
+	(-0.00034, 1, -1, 2, 0, 0),
+	(0.00032, 1, 1, 0, 2, 0),
+	(0.00032, 1, 1, 0, -2, 0),
+	(-0.00028, 2, 2, 1, 0, 0),
+	(0.00027, 1, 1, 2, 0, 0),
+	(-0.00017, 0, 0, 0, 0, 1),
+	(-0.00005, 0, -1, 1, -2, 0),
+	(0.00004, 0, 0, 2, 2, 0),
+	(-0.00004, 0, 1, 1, 2, 0),
+	(0.00004, 0, -2, 1, 0, 0),
+	(0.00003, 0, 1, 1, -2, 0),
+	(0.00003, 0, 3, 0, 0, 0),
+	(0.00002, 0, 0, 2, -2, 0),
+	(0.00002, 0, -1, 1, 2, 0),
+	(-0.00002, 0, 1, 3, 0, 0),
+)
+"""Termos periódicos: (coeficiente, potência de E, múltiplos de M, M', F e Ω)."""
+
+_PLANETARIOS = (
+	(299.77, 0.107408, 0.000325),
+	(251.88, 0.016321, 0.000165),
+	(251.83, 26.651886, 0.000164),
+	(349.42, 36.412478, 0.000126),
+	(84.66, 18.206239, 0.000110),
+	(141.74, 53.303771, 0.000062),
+	(207.14, 2.453732, 0.000060),
+	(154.84, 7.306860, 0.000056),
+	(34.52, 27.261239, 0.000047),
+	(207.19, 0.121824, 0.000042),
+	(291.34, 1.844379, 0.000040),
+	(161.72, 24.198154, 0.000037),
+	(239.56, 25.513099, 0.000035),
+	(331.55, 3.592518, 0.000023),
+)
+
+
+def jde_fase(k: float) -> float:
+	"""Data juliana (TT) da fase `k`: inteiro para Lua Nova, +0.25, +0.5 e +0.75 para as demais."""
+	t = k / 1236.85
+	jde = (
+		2451550.09766
+		+ 29.530588861 * k
+		+ 0.00015437 * t**2
+		- 0.000000150 * t**3
+		+ 0.00000000073 * t**4
+	)
+	e = 1 - 0.002516 * t - 0.0000074 * t**2
+	m = math.radians(2.5534 + 29.10535670 * k - 0.0000014 * t**2 - 0.00000011 * t**3)
+	mlua = math.radians(
+		201.5643 + 385.81693528 * k + 0.0107582 * t**2 + 0.00001238 * t**3 - 0.000000058 * t**4
+	)
+	f = math.radians(160.7108 + 390.67050284 * k - 0.0016118 * t**2 - 0.00000227 * t**3 + 0.000000011 * t**4)
+	omega = math.radians(124.7746 - 1.56375588 * k + 0.0020672 * t**2 + 0.00000215 * t**3)
+
+	fracao = round((k - math.floor(k)) * 4) % 4
+	termos = (_TERMOS_NOVA, _TERMOS_QUARTO, _TERMOS_CHEIA, _TERMOS_QUARTO)[fracao]
+	for coef, pot_e, n_m, n_mlua, n_f, n_omega in termos:
+		jde += coef * e**pot_e * math.sin(n_m * m + n_mlua * mlua + n_f * f + n_omega * omega)
+
+	if fracao in (1, 3):
+		w = (
+			0.00306
+			- 0.00038 * e * math.cos(m)
+			+ 0.00026 * math.cos(mlua)
+			- 0.00002 * math.cos(mlua - m)
+			+ 0.00002 * math.cos(mlua + m)
+			+ 0.00002 * math.cos(2 * f)
+		)
+		jde += w if fracao == 1 else -w
+
+	for i, (base, taxa, coef) in enumerate(_PLANETARIOS):
+		argumento = base + taxa * k
+		if i == 0:
+			argumento -= 0.009173 * t**2
+		jde += coef * math.sin(math.radians(argumento))
+	return jde
+
+
+def gerar_tabela() -> array:
+	"""Instantes das fases de ANO_INICIO a ANO_FIM, em minutos desde JD_EPOCA."""
+	k = math.floor((ANO_INICIO - 2000) * 12.3685) - 1
+	while jde_fase(k) < JD_EPOCA:
+		k += 1
+	tabela = array("I")
+	while True:
+		for quarto in range(4):
+			jde = jde_fase(k + quarto / 4)
+			tabela.append(round((jde - JD_EPOCA) * 1440))
+		if jde > JD_LIMITE:
+			return tabela
+		k += 1
+
+
+def main() -> None:
+	if len(sys.argv) != 2:
+		sys.exit(__doc__)
+	tabela = gerar_tabela()
+	if sys.byteorder != "little":
+		tabela.byteswap()
+	with open(sys.argv[1], "wb") as f:
+		tabela.tofile(f)
+
+
+if __name__ == "__main__":
+	main()
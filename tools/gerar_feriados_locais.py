@@ -0,0 +1,98 @@
+"""Gera o arquivo de feriados estaduais e municipais usado pelo complemento.
+
+Lê um CSV (separado por ";", com cabeçalho codigo;localidade;dia;mes;nome)
+em que `codigo` é o código IBGE da UF (2 dígitos) ou do município
+(7 dígitos), e grava um arquivo binário que o complemento abre com mmap e
+consulta sem montar dicionários. Todos os inteiros são uint32 little-endian:
+
+	cabeçalho    "CFL1", nº de localidades, nº de feriados, nº de textos
+	codigos      códigos IBGE das localidades, em ordem crescente
+	inicios      posição do primeiro feriado de cada localidade (+1 sentinela)
+	localidades  índice do texto com o nome de cada localidade
+	feriados     (mes << 24) | (dia << 16) | índice do texto com o nome
+	offsets      posição, no bloco de textos, do início de cada texto (+1 sentinela)
+	textos       nomes em UTF-8, concatenados
+
+Um município recebe também os feriados da sua UF (os 2 primeiros dígitos do
+código); essa junção é feita na leitura.
+
+Uso: python tools/gerar_feriados_locais.py <arquivo_csv> <arquivo_saida>
+"""
+
+import calendar
+import csv
+import struct
+import sys
+from array import array
+
+MAGICO = b"CFL1"
+
+
+def ler_csv(caminho: str) -> dict[int, tuple[str, list[tuple[int, int, str]]]]:
+	"""Feriados agrupados por código: {codigo: (localidade, [(mes, dia, nome), ...])}."""
+	localidades: dict[int, tuple[str, list[tuple[int, int, str]]]] = {}
+	with open(caminho, encoding="utf-8", newline="") as f:
+		for num_linha, linha in enumerate(csv.DictReader(f, delimiter=";"), 2):
+			codigo = int(linha["codigo"])
+			dia = int(linha["dia"])
+			mes = int(linha["mes"])
+			if len(str(codigo)) not in (2, 7):
+				sys.exit(f"{caminho}:{num_linha}: código IBGE inválido: {codigo}")
+			# 2000 é bissexto, então 29/02 é aceito.
+			if not 1 <= mes <= 12 or not 1 <= dia <= calendar.monthrange(2000, mes)[1]:
+				sys.exit(f"{caminho}:{num_linha}: data inválida: {dia}/{mes}")
+			nome_local, feriados = localidades.setdefault(codigo, (linha["localidade"], []))
+			if nome_local != linha["localidade"]:
+				sys.exit(f"{caminho}:{num_linha}: nome diferente para o código {codigo}")
+			feriados.append((mes, dia, linha["nome"]))
+	return localidades
+
+
+def gerar_arquivo(localidades: dict[int, tuple[str, list[tuple[int, int, str]]]]) -> bytes:
+	textos: list[str] = []
+	indice_texto: dict[str, int] = {}
+
+	def texto(valor: str) -> int:
+		if valor not in indice_texto:
+			indice_texto[valor] = len(textos)
+			textos.append(valor)
+		return indice_texto[valor]
+
+	codigos = array("I")
+	inicios = array("I")
+	nomes_locais = array("I")
+	feriados = array("I")
+	for codigo in sorted(localidades):
+		nome_local, lista = localidades[codigo]
+		codigos.append(codigo)
+		inicios.append(len(feriados))
+		nomes_locais.append(texto(nome_local))
+		for mes, dia, nome in sorted(lista):
+			feriados.append((mes << 24) | (dia << 16) | texto(nome))
+	inicios.append(len(feriados))
+	if len(textos) > 0xFFFF:
+		sys.exit("Textos demais para o formato (máximo 65535)")
+
+	blocos = [t.encode("utf-8") for t in textos]
+	offsets = array("I", [0])
+	for bloco in blocos:
+		offsets.append(offsets[-1] + len(bloco))
+
+	tabelas = (codigos, inicios, nomes_locais, feriados, offsets)
+	if sys.byteorder != "little":
+		for tabela in tabelas:
+			tabela.byteswap()
+	cabecalho = MAGICO + struct.pack("<III", len(codigos), len(feriados), len(textos))
+	return cabecalho + b"".join(t.tobytes() for t in tabelas) + b"".join(blocos)
+
+
+def main() -> None:
+	if len(sys.argv) != 3:
+		sys.exit(__doc__)
+	dados = gerar_arquivo(ler_csv(sys.argv[1]))
+	with open(sys.argv[2], "wb") as f:
+		f.write(dados)
+
+
+if __name__ == "__main__":
+	main()